@@ -0,0 +1,328 @@
+"""
+Throughput and per-stage latency of the authenticated request path.
+
+Drives login, refresh-token and a protected GET /books/{id} through the
+real app in-process. Redis is replaced by fakeredis and the database is a
+local Postgres named by BENCHMARK_DATABASE_URL (tables are created if
+missing; a user and a book are added per run, nothing is deleted).
+
+Results are checked against benchmarks/baselines/auth_throughput.json and
+the run exits non-zero when a scenario regresses past the threshold.
+Baselines are machine specific, so record them where the check runs:
+
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://localhost/bookly_bench \\
+        python -m benchmarks.auth_throughput [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "auth_throughput.json"
+DEFAULT_THRESHOLD = 0.2
+WARMUP_REQUESTS = 5
+PASSWORD = "benchmark-password"
+
+# Limits far above what a run issues, so the limiter is exercised but
+# never rejects.
+RATE_LIMIT_OVERRIDES = {
+    "RATE_LIMIT_LOGIN_PER_IP": "1000000",
+    "RATE_LIMIT_LOGIN_PER_EMAIL": "1000000",
+}
+
+
+class StageTimer:
+    """Records wall time of patched callables, sync or async, by stage name."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, owner: Any, name: str, stage: str) -> None:
+        original = getattr(owner, name)
+
+        async def finish(awaitable, started: float):
+            try:
+                return await awaitable
+            finally:
+                self.samples[stage].append((time.perf_counter() - started) * 1000)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            result = original(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return finish(result, started)
+
+            self.samples[stage].append((time.perf_counter() - started) * 1000)
+            return result
+
+        setattr(owner, name, timed)
+
+    def reset(self) -> None:
+        self.samples.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        return {
+            stage: {"calls": len(samples), "p50_ms": statistics.median(samples)}
+            for stage, samples in sorted(self.samples.items())
+        }
+
+
+def load_app(database_url: str):
+    """Point the app at the benchmark database and fakeredis, then import it."""
+    import fakeredis.aioredis
+    import redis.asyncio
+
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.update(RATE_LIMIT_OVERRIDES)
+
+    fake_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    redis.asyncio.from_url = lambda *args, **kwargs: fake_redis
+
+    # src reads its settings at import time
+    from src import app
+
+    return app
+
+
+def instrument(timer: StageTimer) -> None:
+    import src.auth.dependencies as dependencies
+    import src.auth.rate_limit as rate_limit
+    import src.auth.routes as auth_routes
+    import src.books.routes as book_routes
+
+    timer.wrap(rate_limit, "sliding_window", "rate_limit")
+    timer.wrap(auth_routes.user_service, "get_user_by_email", "user_lookup")
+    timer.wrap(auth_routes, "verify_password", "bcrypt_verify")
+    timer.wrap(auth_routes, "get_token_generation", "token_generation")
+    timer.wrap(auth_routes, "create_access_token", "token_issue")
+
+    timer.wrap(dependencies, "decode_access_token", "token_decode")
+    timer.wrap(dependencies, "is_token_blocked", "blocklist")
+    timer.wrap(dependencies, "get_token_generation", "token_generation")
+    timer.wrap(dependencies, "get_cached_principal", "principal_cache")
+    timer.wrap(dependencies.user_service, "get_principal_by_email", "principal_db")
+
+    timer.wrap(book_routes.book_service, "get_book_detail", "book_detail")
+
+
+async def seed(client: httpx.AsyncClient) -> dict:
+    from sqlmodel import SQLModel
+
+    from src.auth.schemas import UserCreateModel
+    from src.auth.services import UserService
+    from src.books.schemas import BookCreateModel
+    from src.books.service import BookService
+    from src.db.main import async_session_factory, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    async with async_session_factory() as session:
+        user = await UserService().create_user(
+            session,
+            UserCreateModel(
+                username="bench",
+                first_name="Bench",
+                last_name="Mark",
+                email=email,
+                password=PASSWORD,
+            ),
+        )
+        book = await BookService().create_book(
+            session,
+            BookCreateModel(
+                title="Benchmark",
+                author="Author",
+                publisher="Publisher",
+                publish_date="2020",
+                page_count=100,
+                language="en",
+            ),
+            user.uid,
+        )
+
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": email, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    tokens = response.json()
+
+    return {
+        "email": email,
+        "book_id": str(book.uid),
+        "access": {"Authorization": f"Bearer {tokens['access_token']}"},
+        "refresh": {"Authorization": f"Bearer {tokens['refresh_token']}"},
+    }
+
+
+def scenarios(fixtures: dict) -> Dict[str, Callable]:
+    return {
+        "login": lambda client: client.post(
+            "/api/v1/auth/login",
+            json={"email": fixtures["email"], "password": PASSWORD},
+        ),
+        "refresh_token": lambda client: client.get(
+            "/api/v1/auth/refresh-token", headers=fixtures["refresh"]
+        ),
+        "get_book": lambda client: client.get(
+            f"/api/v1/books/{fixtures['book_id']}", headers=fixtures["access"]
+        ),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, send: Callable, requests: int, concurrency: int
+) -> dict:
+    latencies: List[float] = []
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await send(client)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise RuntimeError(f"{response.status_code}: {response.text}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests_per_sec": requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": statistics.quantiles(latencies, n=100)[98],
+    }
+
+
+def check_regressions(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Scenarios slower than baseline by more than ``threshold`` (a fraction)."""
+    failures = []
+    for name, expected in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+
+        if current["requests_per_sec"] < expected["requests_per_sec"] * (1 - threshold):
+            failures.append(
+                f"{name}: {current['requests_per_sec']:.1f} req/s, "
+                f"baseline {expected['requests_per_sec']:.1f}"
+            )
+        if current["p50_ms"] > expected["p50_ms"] * (1 + threshold):
+            failures.append(
+                f"{name}: p50 {current['p50_ms']:.2f} ms, "
+                f"baseline {expected['p50_ms']:.2f}"
+            )
+
+    return failures
+
+
+def print_results(results: dict, baseline: dict) -> None:
+    print(f"{'scenario':<16}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'vs base':>10}")
+    for name, result in results.items():
+        expected = baseline.get(name)
+        change = (
+            f"{result['requests_per_sec'] / expected['requests_per_sec'] - 1:+.0%}"
+            if expected
+            else "-"
+        )
+        print(
+            f"{name:<16}{result['requests_per_sec']:>10.1f}{result['p50_ms']:>10.2f}"
+            f"{result['p99_ms']:>10.2f}{change:>10}"
+        )
+
+    print(f"\n{'scenario':<16}{'stage':<20}{'calls':>8}{'p50 ms':>10}")
+    for name, result in results.items():
+        for stage, summary in result["stages"].items():
+            print(f"{name:<16}{stage:<20}{summary['calls']:>8}{summary['p50_ms']:>10.3f}")
+
+
+async def main(args) -> int:
+    logging.disable(logging.INFO)
+    app = load_app(args.database_url)
+    timer = StageTimer()
+    instrument(timer)
+
+    request_counts = {
+        "login": args.logins,
+        "refresh_token": args.requests,
+        "get_book": args.requests,
+    }
+    results = {}
+
+    transport = httpx.ASGITransport(app=app)
+    # The request logging middleware prints every request; keep its cost but
+    # not its output.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            fixtures = await seed(client)
+
+            for name, send in scenarios(fixtures).items():
+                await run_scenario(client, send, WARMUP_REQUESTS, 1)
+                timer.reset()
+
+                results[name] = await run_scenario(
+                    client, send, request_counts[name], args.concurrency
+                )
+                results[name]["stages"] = timer.summary()
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+
+    failures = check_regressions(results, baseline, args.threshold)
+    if failures:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--database-url", default=os.environ.get("BENCHMARK_DATABASE_URL")
+    )
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown as a fraction of the baseline",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("set BENCHMARK_DATABASE_URL or pass --database-url")
+
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,113 @@
+"""
+Latency of an unrelated endpoint while a burst of logins hashes passwords.
+
+Compares bcrypt verification run inline on the event loop (the old
+behaviour) with ``src.auth.utils.verify_password``, which runs it on the
+bounded password hashing pool. Run with:
+
+    python -m benchmarks.login_storm --logins 40 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.auth.utils import pwd_context, verify_password
+
+PASSWORD = "benchmark-password"
+PING_INTERVAL_SECONDS = 0.01
+
+
+def build_app(hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login-inline")
+    async def login_inline():
+        return {"valid": pwd_context.verify(PASSWORD, hashed_password)}
+
+    @app.post("/login-offloaded")
+    async def login_offloaded():
+        return {"valid": await verify_password(PASSWORD, hashed_password)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def run_scenario(app: FastAPI, login_path: str, logins: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    storm_end = None
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = logins
+
+        async def login_worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await client.post(login_path)
+
+        async def pinger():
+            # Pings are scheduled at a fixed rate and timed from when they
+            # should have been sent, so time spent with the loop blocked is
+            # counted instead of silently skipped.
+            next_at = time.perf_counter()
+            while storm_end is None or next_at < storm_end:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await client.get("/ping")
+                latencies.append((time.perf_counter() - next_at) * 1000)
+                next_at += PING_INTERVAL_SECONDS
+
+        ping_task = asyncio.create_task(pinger())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        storm_end = time.perf_counter()
+        elapsed = storm_end - started
+        await ping_task
+
+    return {
+        "logins_per_sec": logins / elapsed,
+        "pings": len(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies),
+    }
+
+
+async def main(logins: int, concurrency: int):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = build_app(pwd_context.hash(PASSWORD))
+
+    print(f"{logins} logins, {concurrency} concurrent, unrelated GET /ping latency")
+    print(f"{'scenario':<12}{'logins/s':>10}{'pings':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, path in (("inline", "/login-inline"), ("offloaded", "/login-offloaded")):
+        result = await run_scenario(app, path, logins, concurrency)
+        print(
+            f"{name:<12}{result['logins_per_sec']:>10.1f}{result['pings']:>8}"
+            f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['max_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.logins, args.concurrency))
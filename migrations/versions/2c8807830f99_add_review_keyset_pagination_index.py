@@ -0,0 +1,66 @@
+"""add review keyset pagination index
+
+Revision ID: 2c8807830f99
+Revises: 62dd4744c44a
+Create Date: 2026-10-18 15:02:37.418206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8807830f99'
+down_revision: Union[str, Sequence[str], None] = '62dd4744c44a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The composite index leads with user_id, so it replaces ix_review_user_id.
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        # Leftover of an interrupted CONCURRENTLY build, which stays INVALID
+        op.drop_index(
+            'ix_review_user_id_created_at_uid',
+            table_name='review',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_review_user_id_created_at_uid',
+            'review',
+            ['user_id', 'created_at', 'uid'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_review_user_id',
+            table_name='review',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        # As in upgrade(): clear an INVALID leftover before rebuilding
+        op.drop_index(
+            'ix_review_user_id',
+            table_name='review',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_review_user_id', 'review', ['user_id'], postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_review_user_id_created_at_uid',
+            table_name='review',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,65 @@
+"""add book search vector
+
+Revision ID: 3a042ddfa819
+Revises: ab905bdeb47f
+Create Date: 2026-10-18 11:03:27.918240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a042ddfa819'
+down_revision: Union[str, Sequence[str], None] = 'ab905bdeb47f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the book table. It is
+    # committed before the index build, so a rerun finds it already there.
+    op.add_column(
+        'book',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('english', "
+                "coalesce(title, '') || ' ' || coalesce(author, '') || ' ' || coalesce(publisher, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+        if_not_exists=True,
+    )
+
+    with op.get_context().autocommit_block():
+        # Clears an INVALID index left behind by an interrupted earlier run
+        op.drop_index(
+            'ix_book_search_vector',
+            table_name='book',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_book_search_vector',
+            'book',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_book_search_vector', table_name='book', postgresql_concurrently=True
+        )
+    op.drop_column('book', 'search_vector')
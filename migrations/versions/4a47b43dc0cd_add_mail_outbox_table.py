@@ -0,0 +1,45 @@
+"""add mail outbox table
+
+Revision ID: 4a47b43dc0cd
+Revises: 2c8807830f99
+Create Date: 2026-10-18 15:48:12.903514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a47b43dc0cd'
+down_revision: Union[str, Sequence[str], None] = '2c8807830f99'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('mail_outbox',
+    sa.Column('uid', sa.Uuid(), nullable=False),
+    sa.Column('recipients', postgresql.ARRAY(sa.VARCHAR()), nullable=False),
+    sa.Column('subject', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('body', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('dispatched_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('uid')
+    )
+    op.create_index(
+        'ix_mail_outbox_pending',
+        'mail_outbox',
+        ['created_at'],
+        postgresql_where=sa.text('dispatched_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_mail_outbox_pending', table_name='mail_outbox')
+    op.drop_table('mail_outbox')
@@ -0,0 +1,53 @@
+"""add book rating aggregates
+
+Revision ID: 62dd4744c44a
+Revises: 8a348710f4c7
+Create Date: 2026-10-18 13:40:52.118307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '62dd4744c44a'
+down_revision: Union[str, Sequence[str], None] = '8a348710f4c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant defaults are metadata-only on Postgres 11+, no table rewrite
+    op.add_column(
+        'book',
+        sa.Column('review_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.add_column(
+        'book',
+        sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    # Backfill from existing reviews
+    op.execute(
+        """
+        UPDATE book
+        SET review_count = aggregates.review_count,
+            rating_sum = aggregates.rating_sum
+        FROM (
+            SELECT book_id, count(*) AS review_count, sum(rating) AS rating_sum
+            FROM review
+            GROUP BY book_id
+        ) AS aggregates
+        WHERE book.uid = aggregates.book_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('book', 'rating_sum')
+    op.drop_column('book', 'review_count')
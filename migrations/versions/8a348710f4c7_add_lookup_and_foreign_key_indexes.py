@@ -0,0 +1,78 @@
+"""add lookup and foreign key indexes
+
+Revision ID: 8a348710f4c7
+Revises: 3a042ddfa819
+Create Date: 2026-10-18 12:21:09.640187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a348710f4c7'
+down_revision: Union[str, Sequence[str], None] = '3a042ddfa819'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# book.user_id and book.created_at are already covered as leading columns
+# of the keyset pagination indexes added in ab905bdeb47f.
+
+
+INDEXES = (
+    ('ix_user_email', 'user'),
+    ('ix_review_book_id', 'review'),
+    ('ix_review_user_id', 'review'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(
+        sa.text(
+            'SELECT email FROM "user" GROUP BY email HAVING count(*) > 1 LIMIT 5'
+        )
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Cannot create the unique ix_user_email index: duplicate emails "
+            f"exist (e.g. {', '.join(duplicates)}). Deduplicate them and rerun."
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an INVALID index behind that would
+        # block a retry; none of these exist otherwise.
+        for index, table in INDEXES:
+            op.drop_index(
+                index, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
+
+        op.create_index(
+            'ix_user_email',
+            'user',
+            ['email'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_review_book_id', 'review', ['book_id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_review_user_id', 'review', ['user_id'], postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_review_user_id', table_name='review', postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_review_book_id', table_name='review', postgresql_concurrently=True
+        )
+        op.drop_index('ix_user_email', table_name='user', postgresql_concurrently=True)
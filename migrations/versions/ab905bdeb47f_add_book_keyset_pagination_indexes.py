@@ -0,0 +1,64 @@
+"""add book keyset pagination indexes
+
+Revision ID: ab905bdeb47f
+Revises: 45e89043d957
+Create Date: 2026-10-18 10:12:41.502113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab905bdeb47f'
+down_revision: Union[str, Sequence[str], None] = '45e89043d957'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an INVALID index of the same name
+        # behind; drop it first so a rerun can succeed.
+        op.drop_index(
+            'ix_book_created_at_uid',
+            table_name='book',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_book_created_at_uid',
+            'book',
+            ['created_at', 'uid'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_book_user_id_created_at_uid',
+            table_name='book',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_book_user_id_created_at_uid',
+            'book',
+            ['user_id', 'created_at', 'uid'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_book_user_id_created_at_uid',
+            table_name='book',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_book_created_at_uid', table_name='book', postgresql_concurrently=True
+        )
@@ -1,11 +1,13 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from src.auth.routes import auth_router
 from src.books.routes import book_router
-from src.db.main import init_db
+from src.db.main import close_pools, warm_pools
+from src.db.redis import stop_blocklist_listener
 from src.errors import register_all_error_handlers
 from src.middleware import register_all_middleware
 from src.reviews.routes import review_router
@@ -16,9 +18,11 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await warm_pools()
     logger.info("✅ Server has started...")
-    await init_db()
     yield
+    await stop_blocklist_listener()
+    await close_pools()
     logger.info("🏁 Server has stopped!")
 
 
@@ -29,7 +33,7 @@ app = FastAPI(
     version=version,
     port=8000,
     description="Book collection application",
-    # lifespan=lifespan,
+    lifespan=lifespan,
 )
 
 
@@ -42,6 +46,11 @@ async def health():
     return {"message": "Welcome to bookly"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 app.include_router(router=book_router, prefix=f"/api/{version}/books", tags=["books"])
 app.include_router(router=auth_router, prefix=f"/api/{version}/auth", tags=["auth"])
 app.include_router(
@@ -0,0 +1,76 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from src.auth.schemas import PrincipalModel
+from src.config import Config
+from src.db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_KEY_PREFIX = "principal:"
+
+# Two tiers: a short-lived in-process map that answers without any I/O, and
+# Redis shared by all workers. Invalidation clears Redis and the local entry
+# of this worker; other workers converge within PRINCIPAL_LOCAL_TTL_SECONDS.
+_local_principals: "OrderedDict[str, Tuple[float, PrincipalModel]]" = OrderedDict()
+
+
+def principal_cache_key(email: str) -> str:
+    return f"{PRINCIPAL_CACHE_KEY_PREFIX}{email}"
+
+
+def _cache_locally(principal: PrincipalModel) -> None:
+    expires_at = time.monotonic() + Config.PRINCIPAL_LOCAL_TTL_SECONDS
+    _local_principals[principal.email] = (expires_at, principal)
+    _local_principals.move_to_end(principal.email)
+
+    if len(_local_principals) > Config.PRINCIPAL_LOCAL_CACHE_SIZE:
+        _local_principals.popitem(last=False)
+
+
+async def get_cached_principal(email: str) -> Optional[PrincipalModel]:
+    local = _local_principals.get(email)
+    if local is not None:
+        expires_at, principal = local
+        if expires_at > time.monotonic():
+            return principal
+        del _local_principals[email]
+
+    try:
+        cached = await get_redis().get(principal_cache_key(email))
+    except RedisError as e:
+        logger.warning(f"Principal cache read failed: {e}")
+        return None
+
+    if cached is None:
+        return None
+
+    principal = PrincipalModel.model_validate_json(cached)
+    _cache_locally(principal)
+    return principal
+
+
+async def cache_principal(principal: PrincipalModel) -> None:
+    _cache_locally(principal)
+
+    try:
+        await get_redis().set(
+            principal_cache_key(principal.email),
+            principal.model_dump_json(),
+            ex=Config.PRINCIPAL_REDIS_TTL_SECONDS,
+        )
+    except RedisError as e:
+        logger.warning(f"Principal cache write failed: {e}")
+
+
+async def invalidate_principal(email: str) -> None:
+    _local_principals.pop(email, None)
+
+    try:
+        await get_redis().delete(principal_cache_key(email))
+    except RedisError as e:
+        logger.warning(f"Principal cache invalidation failed: {e}")
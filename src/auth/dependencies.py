@@ -4,11 +4,12 @@ from fastapi import Depends, Request
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
 
+from src.auth.cache import cache_principal, get_cached_principal
+from src.auth.schemas import PrincipalModel
 from src.auth.services import UserService
 from src.auth.utils import decode_access_token
 from src.db.main import get_session
-from src.db.models import User
-from src.db.redis import is_token_blocked
+from src.db.redis import get_token_generation, is_token_blocked
 from src.errors import (
     AccessTokenRequiredException,
     AccountNotVerifiedException,
@@ -26,31 +27,40 @@ class TokenBearer(HTTPBearer):
         super().__init__(auto_error=auto_error)
 
     async def __call__(self, request: Request) -> HTTPAuthorizationCredentials | None:
-        creds = await super().__call__(request)
+        # Several bearer instances guard the same request (the route's own,
+        # get_current_principal's, RoleChecker's); only the first one verifies.
+        token_data = getattr(request.state, "token_data", None)
 
-        token = creds.credentials if creds else None
+        if token_data is None:
+            creds = await super().__call__(request)
 
-        # If no token or invalid token, raise 403 Forbidden
-        if token is None or not self.verify_token(token):
-            raise InvalidTokenException()
+            token = creds.credentials if creds else None
 
-        token_data = decode_access_token(token)
+            # No bearer token at all; invalid ones are rejected while decoding
+            if token is None:
+                raise InvalidTokenException()
 
-        # Check if token's JTI is in blocklist
-        jti = token_data.get("jti") if token_data else None
-        if jti and await is_token_blocked(jti):
-            raise InvalidTokenException()
+            token_data = decode_access_token(token)
+
+            # Check if token's JTI is in blocklist
+            jti = token_data.get("jti") if token_data else None
+            if jti and await is_token_blocked(jti):
+                raise InvalidTokenException()
+
+            # Tokens issued before the user's last "log out everywhere"
+            user_id = token_data["user"].get("uid")
+            if user_id and token_data.get("gen", 0) < await get_token_generation(
+                user_id
+            ):
+                raise InvalidTokenException()
+
+            request.state.token_data = token_data
 
         # Additional verification based on token type
         self.verify_token_data(token_data)
 
         return token_data  # type: ignore
 
-    def verify_token(self, token: str) -> bool:
-        token_data = decode_access_token(token)
-
-        return True if token_data is not None else False
-
     def verify_token_data(self, token_data: dict) -> None:
         raise NotImplementedError("Subclasses must implement this method")
 
@@ -67,27 +77,34 @@ class RefreshTokenBearer(TokenBearer):
             raise RefreshTokenRequiredException()
 
 
-async def get_current_user(
+async def get_current_principal(
     token_data: dict = Depends(AccessTokenBearer()), session=Depends(get_session)
-):
+) -> PrincipalModel:
+    """Identity and role of the caller, served from cache when possible."""
     user_email = token_data["user"]["email"]
 
     if user_email is None:
         raise UserNotFoundException()
 
-    user = await user_service.get_user_by_email(session, user_email)
+    principal = await get_cached_principal(user_email)
+    if principal is None:
+        principal = await user_service.get_principal_by_email(session, user_email)
 
-    if user is None:
-        raise UserNotFoundException()
+        if principal is None:
+            raise UserNotFoundException()
+
+        await cache_principal(principal)
 
-    return user
+    return principal
 
 
 class RoleChecker:
     def __init__(self, allowed_roles: List[str]):
         self.allowed_roles = allowed_roles
 
-    async def __call__(self, current_user: User = Depends(get_current_user)):
+    async def __call__(
+        self, current_user: PrincipalModel = Depends(get_current_principal)
+    ):
         # if not current_user.is_verified:
         #     raise AccountNotVerifiedException()
 
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
+
+from fastapi import Request
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from src.config import Config
+from src.db.redis import get_redis
+from src.errors import RateLimitExceededException
+from src.metrics import RATE_LIMIT_FALLBACKS, RATE_LIMIT_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "rate_limit:"
+LOCAL_FALLBACK_MAX_KEYS = 10_000
+
+# Sliding-window log over one sorted set per key (score = request time in
+# ms). A request is admitted only if every key is under its limit, and is
+# then recorded against all of them, so the check and the write are atomic.
+# Returns 0 when admitted, otherwise the ms until the oldest entry of the
+# fullest key leaves the window.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local member = ARGV[3]
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[3 + i]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now)
+    end
+end
+
+if retry_after > 0 then
+    return retry_after
+end
+
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, member)
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+_sliding_window_script: Optional[AsyncScript] = None
+
+
+def sliding_window(keys: List[str], args: list):
+    """Run SLIDING_WINDOW_SCRIPT, registering it with the client on first use."""
+    global _sliding_window_script
+
+    if _sliding_window_script is None:
+        _sliding_window_script = get_redis().register_script(SLIDING_WINDOW_SCRIPT)
+    return _sliding_window_script(keys=keys, args=args)
+
+# Per-worker windows used while Redis is unavailable. Limits then apply per
+# worker rather than globally, which still sheds a burst before it reaches
+# bcrypt or SMTP.
+_local_windows: "OrderedDict[str, Deque[int]]" = OrderedDict()
+
+
+def _check_locally(limits: List[Tuple[str, int]], now_ms: int, window_ms: int) -> int:
+    retry_after = 0
+    for key, limit in limits:
+        hits = _local_windows.setdefault(key, deque())
+        _local_windows.move_to_end(key)
+        while hits and hits[0] <= now_ms - window_ms:
+            hits.popleft()
+        if len(hits) >= limit:
+            retry_after = max(retry_after, hits[0] + window_ms - now_ms)
+
+    if retry_after == 0:
+        for key, _ in limits:
+            _local_windows[key].append(now_ms)
+
+    while len(_local_windows) > LOCAL_FALLBACK_MAX_KEYS:
+        _local_windows.popitem(last=False)
+
+    return retry_after
+
+
+class RateLimiter:
+    """
+    Dependency that limits a route per client IP and, optionally, per email.
+
+    The email is read from the JSON body, so it must be registered on routes
+    whose body has an ``email`` field. Requests over the limit are rejected
+    with 429 and ``Retry-After`` before the route body runs.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        per_ip: int,
+        per_email: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+    ):
+        self.scope = scope
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.window_seconds = window_seconds or Config.RATE_LIMIT_WINDOW_SECONDS
+
+    async def __call__(self, request: Request) -> None:
+        limits = await self._limits(request)
+        now_ms = int(time.time() * 1000)
+        window_ms = self.window_seconds * 1000
+
+        try:
+            retry_after = await asyncio.wait_for(
+                sliding_window(
+                    keys=[key for key, _ in limits],
+                    args=[now_ms, window_ms, uuid.uuid4().hex]
+                    + [limit for _, limit in limits],
+                ),
+                timeout=Config.RATE_LIMIT_REDIS_TIMEOUT_SECONDS,
+            )
+        except (RedisError, asyncio.TimeoutError) as e:
+            RATE_LIMIT_FALLBACKS.inc()
+            logger.warning(f"Rate limiter falling back to local window: {e!r}")
+            retry_after = _check_locally(limits, now_ms, window_ms)
+
+        if retry_after > 0:
+            RATE_LIMIT_REJECTIONS.labels(scope=self.scope).inc()
+            raise RateLimitExceededException(math.ceil(retry_after / 1000))
+
+    async def _limits(self, request: Request) -> List[Tuple[str, int]]:
+        prefix = f"{RATE_LIMIT_KEY_PREFIX}{self.scope}:"
+        client_ip = request.client.host if request.client else "unknown"
+        limits = [(f"{prefix}ip:{client_ip}", self.per_ip)]
+
+        if self.per_email is not None:
+            email = await self._email(request)
+            if email:
+                limits.append((f"{prefix}email:{email}", self.per_email))
+
+        return limits
+
+    async def _email(self, request: Request) -> Optional[str]:
+        # Starlette caches the body, so the route can still parse it
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+
+        email = body.get("email") if isinstance(body, dict) else None
+        return email.strip().lower() if isinstance(email, str) else None
+
+
+login_rate_limiter = RateLimiter(
+    "login",
+    per_ip=Config.RATE_LIMIT_LOGIN_PER_IP,
+    per_email=Config.RATE_LIMIT_LOGIN_PER_EMAIL,
+)
+signup_rate_limiter = RateLimiter("signup", per_ip=Config.RATE_LIMIT_SIGNUP_PER_IP)
+password_reset_rate_limiter = RateLimiter(
+    "password_reset",
+    per_ip=Config.RATE_LIMIT_PASSWORD_RESET_PER_IP,
+    per_email=Config.RATE_LIMIT_PASSWORD_RESET_PER_EMAIL,
+)
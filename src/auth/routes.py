@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, status
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio.session import AsyncSession
@@ -9,13 +10,19 @@ from src.auth.dependencies import (
     AccessTokenBearer,
     RefreshTokenBearer,
     RoleChecker,
-    get_current_user,
+    get_current_principal,
+)
+from src.auth.rate_limit import (
+    login_rate_limiter,
+    password_reset_rate_limiter,
+    signup_rate_limiter,
 )
 from src.auth.schemas import (
     EmailSchema,
+    PrincipalModel,
     UserCreateModel,
     UserLoginModel,
-    UserModelWithBooks,
+    UserProfileModel,
 )
 from src.auth.services import UserService
 from src.auth.utils import (
@@ -25,15 +32,25 @@ from src.auth.utils import (
     verify_email_confirmation_token,
     verify_password,
 )
-from src.celery_tasks import send_email
+from src.books.schemas import BookPage
+from src.books.service import BookService
 from src.config import Config
-from src.db.main import get_session
-from src.db.redis import add_token_to_blocklist
+from src.db.main import get_read_session, get_session
+from src.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.db.redis import (
+    add_token_to_blocklist,
+    bump_token_generation,
+    get_token_generation,
+)
 from src.errors import InvalidCredentialsException, UserNotFoundException
-from src.mail import create_message, mail
+from src.outbox import enqueue_mail, relay_pending_mail
+from src.reviews.schemas import ReviewPage
+from src.reviews.services import ReviewService
 
 auth_router = APIRouter()
 user_service = UserService()
+book_service = BookService()
+review_service = ReviewService()
 refresh_token_bearer = RefreshTokenBearer()
 access_token_bearer = AccessTokenBearer()
 role_checker = RoleChecker(["admin", "user"])
@@ -41,6 +58,8 @@ role_checker = RoleChecker(["admin", "user"])
 
 @auth_router.post("/send-mail")
 async def send_test_mail(recipients: EmailSchema):
+    from src.celery_tasks import send_email
+
     send_email.delay(  # type: ignore[attr-defined]
         recipients=recipients.email_addresses,
         subject="Test Mail from Bookly",
@@ -70,21 +89,18 @@ async def verify_email(token: str, session: AsyncSession = Depends(get_session))
     return {"message": "Email verified successfully"}
 
 
-@auth_router.post("/signup", status_code=status.HTTP_201_CREATED)
+@auth_router.post(
+    "/signup",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(signup_rate_limiter)],
+)
 async def signup(
-    user_data: UserCreateModel, session: AsyncSession = Depends(get_session)
+    user_data: UserCreateModel,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
 ):
-    is_user_exist = await user_service.is_user_exist(session, user_data.email)
-    if is_user_exist:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User with this email already exists",
-        )
-
-    new_user = await user_service.create_user(session, user_data)
-
     # User verification
-    verification_token = create_email_confirmation_token(new_user.email)
+    verification_token = create_email_confirmation_token(user_data.email)
     verification_link = (
         f"{Config.DOMAIN}/api/v1/auth/verify-email?token={verification_token}"
     )
@@ -92,7 +108,7 @@ async def signup(
     email_template = f"""
     <html>
         <body>
-            <h2>Welcome to Bookly, {new_user.first_name} {new_user.last_name}!</h2>
+            <h2>Welcome to Bookly, {user_data.first_name} {user_data.last_name}!</h2>
             <p>Thank you for signing up. Please verify your email address by clicking the link below:</p>
             <a href="{verification_link}">Verify Email</a>
             <p>If you did not sign up for this account, please ignore this email.</p>
@@ -102,39 +118,46 @@ async def signup(
     </html>
     """
 
-    message = create_message(
+    # Staged in the session: create_user commits it together with the user, or
+    # leaves it uncommitted (and discarded) when the email is already taken
+    enqueue_mail(
+        session,
         subject="Welcome to Bookly - Verify Your Email",
-        recipients=[new_user.email],
+        recipients=[user_data.email],
         body=email_template,
     )
 
-    email_sent = True
-    try:
-        await mail.send_message(message)
-    except Exception as e:
-        # Log the error but don't fail the signup
-        print(f"Failed to send verification email: {e}")
-        email_sent = False
+    new_user = await user_service.create_user(session, user_data)
+    if new_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User with this email already exists",
+        )
+
+    background_tasks.add_task(relay_pending_mail)
 
     return JSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={
-            "message": "User created successfully. Please check your email to verify your account."
-            if email_sent
-            else "User created successfully. Email verification is temporarily unavailable.",
+            "message": "User created successfully. Please check your email to verify your account.",
             "user": new_user.model_dump(mode="json"),
         },
     )
 
 
-@auth_router.post("/login")
+@auth_router.post("/login", dependencies=[Depends(login_rate_limiter)])
 async def login(
-    login_data: UserLoginModel, session: AsyncSession = Depends(get_session)
+    login_data: UserLoginModel,
+    # Primary: a lagging replica could still accept a password just reset,
+    # and login carries no token to pin reads by
+    session: AsyncSession = Depends(get_session),
 ):
     user = await user_service.get_user_by_email(session, login_data.email)
 
     if user is not None:
-        is_valid_password = verify_password(login_data.password, user.hashed_password)
+        is_valid_password = await verify_password(
+            login_data.password, user.hashed_password
+        )
 
         if is_valid_password:
             user_payload = {
@@ -142,9 +165,13 @@ async def login(
                 "email": user.email,
                 "role": user.role,
             }
-            access_token = create_access_token(user_payload)
+            generation = await get_token_generation(str(user.uid), fresh=True)
+            access_token = create_access_token(user_payload, generation=generation)
             refresh_token = create_access_token(
-                user_payload, expiry=timedelta(days=2), refresh=True
+                user_payload,
+                expiry=timedelta(days=2),
+                refresh=True,
+                generation=generation,
             )
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
@@ -173,7 +200,9 @@ async def get_new_access_token(token_details: dict = Depends(refresh_token_beare
             detail="Refresh token has expired, please login again",
         )
 
-    new_access_token = create_access_token(user_data)
+    new_access_token = create_access_token(
+        user_data, generation=token_details.get("gen", 0)
+    )
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -184,12 +213,45 @@ async def get_new_access_token(token_details: dict = Depends(refresh_token_beare
     )
 
 
-@auth_router.get("/me", response_model=UserModelWithBooks)
+@auth_router.get("/me", response_model=UserProfileModel)
 async def get_current_user_details(
-    current_user: UserModelWithBooks = Depends(get_current_user),
+    principal: PrincipalModel = Depends(get_current_principal),
+    _: bool = Depends(role_checker),
+    session: AsyncSession = Depends(get_read_session),
+):
+    profile = await user_service.get_user_profile(session, principal.uid)
+    if profile is None:
+        raise UserNotFoundException()
+
+    return profile
+
+
+@auth_router.get("/me/books", response_model=BookPage)
+async def get_current_user_books(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    principal: PrincipalModel = Depends(get_current_principal),
     _: bool = Depends(role_checker),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    return current_user
+    books, next_cursor = await book_service.get_user_books(
+        session, principal.uid, limit=limit, cursor=cursor
+    )
+    return {"items": books, "next_cursor": next_cursor}
+
+
+@auth_router.get("/me/reviews", response_model=ReviewPage)
+async def get_current_user_reviews(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    principal: PrincipalModel = Depends(get_current_principal),
+    _: bool = Depends(role_checker),
+    session: AsyncSession = Depends(get_read_session),
+):
+    reviews, next_cursor = await review_service.get_user_reviews(
+        session, principal.uid, limit=limit, cursor=cursor
+    )
+    return {"items": reviews, "next_cursor": next_cursor}
 
 
 @auth_router.post("/logout")
@@ -198,7 +260,7 @@ async def revoke_token(
 ):
     jti = token_details["jti"]
 
-    await add_token_to_blocklist(jti)
+    await add_token_to_blocklist(jti, token_details["exp"])
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -206,9 +268,25 @@ async def revoke_token(
     )
 
 
-@auth_router.post("/reset-password-request")
+@auth_router.post("/logout-all")
+async def revoke_all_tokens(
+    token_details: dict = Depends(access_token_bearer),
+):
+    await bump_token_generation(token_details["user"]["uid"])
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"message": "Logged out of all sessions"},
+    )
+
+
+@auth_router.post(
+    "/reset-password-request", dependencies=[Depends(password_reset_rate_limiter)]
+)
 async def password_reset_request(
-    email: str = Body(..., embed=True), session: AsyncSession = Depends(get_session)
+    background_tasks: BackgroundTasks,
+    email: str = Body(..., embed=True),
+    session: AsyncSession = Depends(get_session),
 ):
     user = await user_service.get_user_by_email(session, email)
     if not user:
@@ -233,13 +311,14 @@ async def password_reset_request(
     </html>
     """
 
-    message = create_message(
+    enqueue_mail(
+        session,
         subject="Bookly - Password Reset Request",
         recipients=[user.email],
         body=reset_password_template,
     )
-
-    await mail.send_message(message)
+    await session.commit()
+    background_tasks.add_task(relay_pending_mail)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -265,7 +344,9 @@ async def reset_password(
     if not user:
         raise UserNotFoundException()
 
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password(password)
     await user_service.update_users(session, user, {"hashed_password": hashed_password})
+    # Sessions opened with the old password must not survive the reset
+    await bump_token_generation(str(user.uid))
 
     return {"message": "Password has been reset successfully"}
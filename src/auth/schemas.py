@@ -4,9 +4,6 @@ from typing import List
 
 from pydantic import BaseModel, Field
 
-from src.books.schemas import Book
-from src.reviews.schemas import ReviewModel
-
 
 class UserCreateModel(BaseModel):
     username: str = Field(..., max_length=50)
@@ -29,9 +26,18 @@ class UserModel(BaseModel):
     updated_at: datetime
 
 
-class UserModelWithBooks(UserModel):
-    books: List[Book] = []
-    reviews: List["ReviewModel"] = []
+class PrincipalModel(BaseModel):
+    """The slice of a user needed to authorize a request."""
+
+    uid: uuid.UUID
+    email: str
+    role: str
+    is_verified: bool
+
+
+class UserProfileModel(UserModel):
+    book_count: int
+    review_count: int
 
 
 class UserLoginModel(BaseModel):
@@ -1,9 +1,15 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 
-from src.auth.schemas import UserCreateModel
+from src.auth.cache import invalidate_principal
+from src.auth.schemas import PrincipalModel, UserCreateModel, UserProfileModel
 from src.auth.utils import hash_password
-from src.db.models import User
+from src.db.models import Book, Review, User
 
 
 class UserService:
@@ -13,20 +19,76 @@ class UserService:
 
         return result.scalar_one_or_none()
 
-    async def is_user_exist(self, session: AsyncSession, email: str) -> bool:
-        user = await self.get_user_by_email(session, email)
-        return True if user else False
+    async def get_user_profile(
+        self, session: AsyncSession, user_id: uuid.UUID
+    ) -> Optional[UserProfileModel]:
+        """The user with counts of their books and reviews, not the rows."""
+        book_count = (
+            select(func.count(Book.uid)).where(Book.user_id == User.uid).scalar_subquery()
+        )
+        review_count = (
+            select(func.count(Review.uid))
+            .where(Review.user_id == User.uid)
+            .scalar_subquery()
+        )
+        statement = select(
+            User,
+            book_count.label("book_count"),
+            review_count.label("review_count"),
+        ).where(User.uid == user_id)
+        result = await session.execute(statement)
+        row = result.one_or_none()
+
+        if row is None:
+            return None
+
+        return UserProfileModel(
+            **row.User.model_dump(),
+            book_count=row.book_count,
+            review_count=row.review_count,
+        )
+
+    async def get_principal_by_email(
+        self, session: AsyncSession, email: str
+    ) -> Optional[PrincipalModel]:
+        statement = select(User.uid, User.email, User.role, User.is_verified).where(
+            User.email == email
+        )
+        result = await session.execute(statement)
+        row = result.one_or_none()
 
-    async def create_user(self, session: AsyncSession, user_data: UserCreateModel):
+        return PrincipalModel.model_validate(row, from_attributes=True) if row else None
+
+    async def create_user(
+        self, session: AsyncSession, user_data: UserCreateModel
+    ) -> Optional[User]:
+        """
+        Insert the user unless the email is taken, in a single statement.
+
+        Returns None on a duplicate email; the caller's transaction is then
+        left uncommitted so anything staged with it is discarded. A duplicate
+        still pays for hashing the password: the route's per-IP rate limit
+        bounds that, and no lookup round trip is spent on every signup.
+        """
         new_user = User.model_validate(user_data)
-        new_user.hashed_password = hash_password(user_data.password)
         new_user.role = "user"
 
-        session.add(new_user)
-        await session.commit()
-        await session.refresh(new_user)
+        statement = (
+            insert(User)
+            .values(
+                **new_user.model_dump(),
+                hashed_password=await hash_password(user_data.password),
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
+        )
+        result = await session.execute(statement)
+        created = result.scalar_one_or_none()
+
+        if created is not None:
+            await session.commit()
 
-        return new_user
+        return created
 
     async def update_users(self, session: AsyncSession, user: User, update_data: dict):
         for key, value in update_data.items():
@@ -34,5 +96,6 @@ class UserService:
 
         await session.commit()
         await session.refresh(user)
+        await invalidate_principal(user.email)
 
         return user
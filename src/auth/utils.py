@@ -1,6 +1,11 @@
+import asyncio
+import hashlib
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 import jwt
 from fastapi.exceptions import HTTPException
@@ -8,19 +13,53 @@ from itsdangerous import URLSafeTimedSerializer
 from passlib.context import CryptContext
 from starlette import status
 
+from src.config import Config
+from src.metrics import PASSWORD_HASH_QUEUE_DEPTH, PASSWORD_HASH_SECONDS
+
+T = TypeVar("T")
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt takes ~250ms of CPU per call and releases the GIL, so it runs on a
+# dedicated bounded pool instead of blocking the event loop or starving the
+# default thread pool FastAPI uses for sync dependencies.
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=Config.PASSWORD_HASH_CONCURRENCY, thread_name_prefix="password-hash"
+)
+
+
+def _timed(func: Callable[..., T], *args) -> T:
+    with PASSWORD_HASH_SECONDS.time():
+        return func(*args)
+
+
+async def _run_password_hash(func: Callable[..., T], *args) -> T:
+    loop = asyncio.get_running_loop()
+    # Counted here rather than read off the executor's private queue
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    try:
+        return await loop.run_in_executor(
+            password_hash_executor, _timed, func, *args
+        )
+    finally:
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    return await _run_password_hash(pwd_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_hash(
+        pwd_context.verify, plain_password, hashed_password
+    )
 
 
 def create_access_token(
-    user_data: dict, expiry: Optional[timedelta] = None, refresh: bool = False
+    user_data: dict,
+    expiry: Optional[timedelta] = None,
+    refresh: bool = False,
+    generation: int = 0,
 ) -> str:
     payload = {}
 
@@ -28,14 +67,38 @@ def create_access_token(
     payload["exp"] = datetime.now() + (expiry if expiry else timedelta(minutes=30))
     payload["jti"] = str(uuid.uuid4())
     payload["refresh"] = refresh
+    # Token generation of the user at issue time; see bump_token_generation
+    payload["gen"] = generation
 
     token = jwt.encode(payload=payload, key="VERY_SECRET_KEY", algorithm="HS256")
     return token
 
 
+# Payloads of tokens that already passed signature verification, keyed by
+# the SHA-256 of the full token (signature included), so only a byte-identical
+# token can hit. Entries are dropped once the token's own exp has passed.
+_verified_tokens: "OrderedDict[str, dict]" = OrderedDict()
+
+
 def decode_access_token(token: str) -> dict:
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+
+    cached = _verified_tokens.get(cache_key)
+    if cached is not None:
+        if cached["exp"] > time.time():
+            _verified_tokens.move_to_end(cache_key)
+            return cached
+
+        # Expired: fall through so jwt.decode reports it as usual
+        del _verified_tokens[cache_key]
+
     try:
         payload = jwt.decode(jwt=token, key="VERY_SECRET_KEY", algorithms=["HS256"])
+
+        _verified_tokens[cache_key] = payload
+        if len(_verified_tokens) > Config.VERIFIED_TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
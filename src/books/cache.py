@@ -0,0 +1,58 @@
+import logging
+import uuid
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from src.books.schemas import BookDetailModel
+from src.config import Config
+from src.db.redis import get_redis
+from src.metrics import BOOK_CACHE_ERRORS, BOOK_CACHE_HITS, BOOK_CACHE_MISSES
+
+logger = logging.getLogger(__name__)
+
+BOOK_CACHE_KEY_PREFIX = "book:detail:"
+
+
+def book_cache_key(book_id: uuid.UUID) -> str:
+    return f"{BOOK_CACHE_KEY_PREFIX}{book_id}"
+
+
+# Redis being unavailable must never fail a request; every operation below
+# degrades to "not cached" and is counted so it shows up on the dashboard.
+
+
+async def get_cached_book(book_id: uuid.UUID) -> Optional[BookDetailModel]:
+    try:
+        cached = await get_redis().get(book_cache_key(book_id))
+    except RedisError as e:
+        BOOK_CACHE_ERRORS.inc()
+        logger.warning(f"Book cache read failed: {e}")
+        return None
+
+    if cached is None:
+        BOOK_CACHE_MISSES.inc()
+        return None
+
+    BOOK_CACHE_HITS.inc()
+    return BookDetailModel.model_validate_json(cached)
+
+
+async def cache_book(book: BookDetailModel) -> None:
+    try:
+        await get_redis().set(
+            book_cache_key(book.uid),
+            book.model_dump_json(),
+            ex=Config.BOOK_CACHE_TTL_SECONDS,
+        )
+    except RedisError as e:
+        BOOK_CACHE_ERRORS.inc()
+        logger.warning(f"Book cache write failed: {e}")
+
+
+async def invalidate_book(book_id: uuid.UUID) -> None:
+    try:
+        await get_redis().delete(book_cache_key(book_id))
+    except RedisError as e:
+        BOOK_CACHE_ERRORS.inc()
+        logger.warning(f"Book cache invalidation failed: {e}")
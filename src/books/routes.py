@@ -1,15 +1,36 @@
-from typing import List
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Literal, Optional, Tuple
 import uuid
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_404_NOT_FOUND
 
 from src.auth.dependencies import AccessTokenBearer, RoleChecker
-from src.books.schemas import Book, BookCreateModel, BookDetailModel, BookUpdateModel
+from src.books.schemas import (
+    Book,
+    BookCreateModel,
+    BookDetailModel,
+    BookImportResultModel,
+    BookPage,
+    BookUpdateModel,
+)
 from src.books.service import BookService
-from src.db.main import get_session
+from src.books.utils import (
+    book_etag,
+    has_conditional_headers,
+    is_not_modified,
+    not_modified_response,
+    page_etag,
+    set_validator_headers,
+)
+from src.db.main import get_read_session, get_session
+from src.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.errors import BookNotFoundException
 
 book_router = APIRouter()
@@ -20,30 +41,140 @@ role_checker = Depends(RoleChecker(["admin","user"]))
 
 @book_router.get(
     "/",
-    response_model=List[Book],
+    response_model=BookPage,
     status_code=status.HTTP_200_OK,
     dependencies=[role_checker],
 )
 async def get_all_books(
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    books = await book_service.get_all_books(session)
-    return books
+    if has_conditional_headers(request):
+        validators, next_cursor = await book_service.get_page_validators(
+            session, limit=limit, cursor=cursor
+        )
+        etag = page_etag(validators, next_cursor)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+    books, next_cursor = await book_service.get_all_books(
+        session, limit=limit, cursor=cursor
+    )
+    set_validator_headers(response, page_etag(books, next_cursor))
+    return {"items": books, "next_cursor": next_cursor}
+
+
+@book_router.get(
+    "/search",
+    response_model=BookPage,
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    books, next_cursor = await book_service.search_books(
+        session, q, limit=limit, cursor=cursor
+    )
+    return {"items": books, "next_cursor": next_cursor}
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+async def _export_ndjson(batches, fields: List[str]) -> AsyncIterator[str]:
+    async for rows in batches:
+        yield "".join(
+            json.dumps(
+                {field: _export_value(value) for field, value in zip(fields, row)}
+            )
+            + "\n"
+            for row in rows
+        )
+
+
+async def _export_csv(batches, fields: List[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    async for rows in batches:
+        writer.writerows([_export_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only, for an empty catalog
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@book_router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def export_books(
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """Stream the whole catalog as NDJSON or CSV without buffering it."""
+    fields = list(Book.model_fields)
+    batches = book_service.stream_books(session, fields)
+
+    if export_format == "csv":
+        content, media_type = _export_csv(batches, fields), "text/csv"
+    else:
+        content, media_type = _export_ndjson(batches, fields), "application/x-ndjson"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="books.{export_format}"'
+        },
+    )
 
 
 @book_router.get( 
     "/user/{user_id}",
-    response_model=List[Book],
+    response_model=BookPage,
     status_code=status.HTTP_200_OK,
     dependencies=[role_checker],
 )
 async def get_all_books_by_user(
     user_id: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
 ):
-    books = await book_service.get_user_books(session, user_id=uuid.UUID(user_id))
-    return books
+    if has_conditional_headers(request):
+        validators, next_cursor = await book_service.get_page_validators(
+            session, limit=limit, cursor=cursor, user_id=uuid.UUID(user_id)
+        )
+        etag = page_etag(validators, next_cursor)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+    books, next_cursor = await book_service.get_user_books(
+        session, user_id=uuid.UUID(user_id), limit=limit, cursor=cursor
+    )
+    set_validator_headers(response, page_etag(books, next_cursor))
+    return {"items": books, "next_cursor": next_cursor}
 
     
 @book_router.get(
@@ -54,11 +185,39 @@ async def get_all_books_by_user(
 )
 async def get_book(
     book_id: str,
+    request: Request,
+    response: Response,
+    # Primary, not a replica: a lagging read here would be written back to
+    # the shared Redis cache and outlive the invalidation that preceded it
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    book = await book_service.get_book(session, book_id)
+    # Revalidation only needs timestamps, not the book and its reviews
+    if has_conditional_headers(request):
+        validators = await book_service.get_book_validators(session, book_id)
+        if validators is None:
+            raise BookNotFoundException()
+
+        etag = book_etag(
+            validators.uid,
+            validators.updated_at,
+            validators.review_count,
+            validators.last_review_at,
+        )
+        last_modified = max(
+            validators.updated_at, validators.last_review_at or validators.updated_at
+        )
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+    book = await book_service.get_book_detail(session, book_id)
     if book:
+        last_review_at = max((review.updated_at for review in book.reviews), default=None)
+        set_validator_headers(
+            response,
+            book_etag(book.uid, book.updated_at, book.review_count, last_review_at),
+            max(book.updated_at, last_review_at or book.updated_at),
+        )
         return book
 
     raise BookNotFoundException()
@@ -80,6 +239,71 @@ async def create_book(
     return new_book
 
 
+async def _iter_ndjson(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield ``(index, payload)`` per line of an NDJSON body as it streams in."""
+    index = 0
+    buffer = b""
+
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _parse_ndjson_line(line)
+                index += 1
+
+    if buffer.strip():
+        yield index, _parse_ndjson_line(buffer)
+
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        # Left for BookCreateModel to reject, so it is reported per row
+        return line.decode(errors="replace")
+
+
+async def _iter_json_array(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array of books",
+        )
+
+    for index, item in enumerate(payload):
+        yield index, item
+
+
+@book_router.post(
+    "/bulk",
+    response_model=BookImportResultModel,
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def bulk_create_books(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+):
+    """Import a JSON array or an ``application/x-ndjson`` stream of books."""
+    user_id = token_details["user"]["uid"]
+
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/x-ndjson"):
+        rows = _iter_ndjson(request)
+    else:
+        rows = _iter_json_array(request)
+
+    created, errors = await book_service.bulk_create_books(session, rows, user_id)
+    return {"created": created, "errors": errors}
+
+
 @book_router.patch("/{book_id}", response_model=Book, status_code=status.HTTP_200_OK, dependencies=[role_checker])
 async def update_book(
     book_id: str,
@@ -100,8 +324,8 @@ async def delete_book(
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    deleted_book = await book_service.delete_book(session, book_id)
-    if deleted_book is None:
+    deleted_book_uid = await book_service.delete_book(session, book_id)
+    if deleted_book_uid is not None:
         return {"message": "Book deleted successfully"}
 
     raise BookNotFoundException()
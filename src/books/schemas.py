@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 from src.reviews.schemas import ReviewModel
 
@@ -14,12 +15,25 @@ class Book(BaseModel):
     publish_date: str
     page_count: int
     language: str
+    review_count: int = 0
+    rating_sum: int = 0
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
+    @property
+    def average_rating(self) -> Optional[float]:
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
 class BookDetailModel(Book):
     reviews: list["ReviewModel"]
 
+class BookPage(BaseModel):
+    items: List[Book]
+    next_cursor: Optional[str] = None
+
 class BookCreateModel(BaseModel):
     title: str
     author: str
@@ -29,6 +43,16 @@ class BookCreateModel(BaseModel):
     language: str
 
 
+class BookImportErrorModel(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BookImportResultModel(BaseModel):
+    created: int
+    errors: List[BookImportErrorModel]
+
+
 class BookUpdateModel(BaseModel):
     title: str
     author: str
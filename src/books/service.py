@@ -1,31 +1,186 @@
 import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, tuple_, update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlmodel import desc, select
 
-from src.db.models import Book
-from src.books.schemas import BookCreateModel, BookUpdateModel
+from src.books.cache import cache_book, get_cached_book, invalidate_book
+from src.db.models import Book, Review
+from src.db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    build_page,
+    decode_created_at_cursor,
+    decode_rank_cursor,
+)
+from src.books.schemas import BookCreateModel, BookDetailModel, BookUpdateModel
+
+# Rows per multi-row INSERT; keeps each statement well under asyncpg's
+# 32767 bind parameter limit.
+BULK_IMPORT_CHUNK_SIZE = 1000
+
+# Rows fetched per round trip from the server-side cursor during export
+EXPORT_BATCH_SIZE = 1000
 
 
 class BookService:
-    async def get_all_books(self, session: AsyncSession):
-        statement = select(Book).order_by(desc(Book.created_at))
+    def _paginate(self, statement, limit: int, cursor: Optional[str]):
+        if cursor:
+            created_at, uid = decode_created_at_cursor(cursor)
+            statement = statement.where(
+                tuple_(Book.created_at, Book.uid) < tuple_(created_at, uid)
+            )
+
+        return statement.order_by(desc(Book.created_at), desc(Book.uid)).limit(
+            limit + 1
+        )
+
+    async def get_all_books(
+        self,
+        session: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ):
+        statement = self._paginate(select(Book), limit, cursor)
         result = await session.execute(statement)
 
-        return result.scalars().all()
-    
-    async def get_user_books(self, session: AsyncSession, user_id: uuid.UUID):
-        statement = select(Book).where(Book.user_id == user_id).order_by(desc(Book.created_at))
+        return build_page(
+            result.scalars().all(), limit, key=lambda book: (book.created_at, book.uid)
+        )
+
+    async def get_user_books(
+        self,
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ):
+        statement = self._paginate(
+            select(Book).where(Book.user_id == user_id), limit, cursor
+        )
+        result = await session.execute(statement)
+
+        return build_page(
+            result.scalars().all(), limit, key=lambda book: (book.created_at, book.uid)
+        )
+
+    async def get_page_validators(
+        self,
+        session: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        user_id: Optional[uuid.UUID] = None,
+    ):
+        """Fetch only the columns a page ETag is built from, for the same page."""
+        statement = select(Book.uid, Book.created_at, Book.updated_at, Book.review_count)
+        if user_id is not None:
+            statement = statement.where(Book.user_id == user_id)
+
+        result = await session.execute(self._paginate(statement, limit, cursor))
+
+        return build_page(
+            result.all(), limit, key=lambda row: (row.created_at, row.uid)
+        )
+
+    async def search_books(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ):
+        ts_query = func.websearch_to_tsquery("english", query)
+        rank = func.ts_rank_cd(Book.search_vector, ts_query)
+
+        statement = select(Book, rank.label("rank")).where(
+            Book.search_vector.op("@@")(ts_query)
+        )
+        if cursor:
+            last_rank, last_uid = decode_rank_cursor(cursor)
+            statement = statement.where(
+                tuple_(rank, Book.uid) < tuple_(last_rank, last_uid)
+            )
+
+        statement = statement.order_by(desc(rank), desc(Book.uid)).limit(limit + 1)
         result = await session.execute(statement)
 
-        return result.scalars().all()
+        rows, next_cursor = build_page(
+            result.all(), limit, key=lambda row: (row.rank, row.Book.uid)
+        )
+        return [row.Book for row in rows], next_cursor
+
+    async def stream_books(self, session: AsyncSession, fields: List[str]):
+        """Yield batches of catalog rows from a server-side cursor."""
+        statement = (
+            select(*(getattr(Book, field) for field in fields))
+            .order_by(Book.created_at, Book.uid)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        result = await session.stream(statement)
+
+        async for rows in result.partitions():
+            yield rows
 
-    async def get_book(self, session: AsyncSession, book_id: str):
+    async def get_book(
+        self, session: AsyncSession, book_id: str, load_reviews: bool = False
+    ):
         statement = select(Book).where(Book.uid == book_id)
+        if load_reviews:
+            statement = statement.options(selectinload(Book.reviews))
+
         result = await session.execute(statement)
         book = result.scalar_one_or_none()
 
         return book
 
+    async def get_book_validators(self, session: AsyncSession, book_id: str):
+        """Fetch only the timestamps and count the detail ETag is built from."""
+        try:
+            uuid.UUID(book_id)
+        except ValueError:
+            return None
+
+        last_review_at = (
+            select(func.max(Review.updated_at))
+            .where(Review.book_id == Book.uid)
+            .scalar_subquery()
+        )
+        statement = select(
+            Book.uid,
+            Book.updated_at,
+            Book.review_count,
+            last_review_at.label("last_review_at"),
+        ).where(Book.uid == book_id)
+        result = await session.execute(statement)
+
+        return result.one_or_none()
+
+    async def get_book_detail(
+        self, session: AsyncSession, book_id: str
+    ) -> Optional[BookDetailModel]:
+        """Read-through Redis cache in front of get_book with reviews."""
+        try:
+            book_uid = uuid.UUID(book_id)
+        except ValueError:
+            return None
+
+        cached = await get_cached_book(book_uid)
+        if cached is not None:
+            return cached
+
+        book = await self.get_book(session, book_id, load_reviews=True)
+        if book is None:
+            return None
+
+        book_detail = BookDetailModel.model_validate(book, from_attributes=True)
+        await cache_book(book_detail)
+
+        return book_detail
+
     async def create_book(self, session: AsyncSession, book_data: BookCreateModel,user_id:uuid.UUID):
         new_book = Book.model_validate(book_data)
         new_book.user_id = user_id
@@ -36,28 +191,118 @@ class BookService:
 
         return new_book
 
+    async def bulk_create_books(
+        self,
+        session: AsyncSession,
+        rows: AsyncIterator[Tuple[int, Any]],
+        user_id: uuid.UUID,
+    ):
+        """
+        Validate and insert ``(index, payload)`` rows in chunks.
+
+        Each chunk is written with a single multi-row ``INSERT ... RETURNING``
+        and committed on its own. Rows that fail validation, or that the
+        database rejects, are reported by index instead of aborting the import.
+        """
+        created = 0
+        errors: List[dict] = []
+        chunk: List[Tuple[int, dict]] = []
+
+        async for index, payload in rows:
+            try:
+                book_data = BookCreateModel.model_validate(payload)
+            except ValidationError as e:
+                errors.append(
+                    {
+                        "index": index,
+                        "errors": e.errors(
+                            include_url=False, include_context=False, include_input=False
+                        ),
+                    }
+                )
+                continue
+
+            chunk.append((index, self._bulk_row(book_data, user_id)))
+            if len(chunk) >= BULK_IMPORT_CHUNK_SIZE:
+                created += await self._insert_chunk(session, chunk, errors)
+                chunk = []
+
+        if chunk:
+            created += await self._insert_chunk(session, chunk, errors)
+
+        return created, errors
+
+    def _bulk_row(self, book_data: BookCreateModel, user_id: uuid.UUID) -> dict:
+        now = datetime.now()
+        return {
+            **book_data.model_dump(),
+            "uid": uuid.uuid4(),
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    async def _insert_chunk(
+        self, session: AsyncSession, chunk: List[Tuple[int, dict]], errors: List[dict]
+    ) -> int:
+        try:
+            async with session.begin_nested():
+                result = await session.execute(
+                    insert(Book).returning(Book.uid), [row for _, row in chunk]
+                )
+                created = len(result.all())
+
+        except DBAPIError:
+            # Retry row by row so one bad row only costs itself
+            created = 0
+            for index, row in chunk:
+                try:
+                    async with session.begin_nested():
+                        await session.execute(insert(Book), [row])
+                    created += 1
+                except DBAPIError as e:
+                    # e.orig is the DBAPI adapter error; its cause is the
+                    # driver's error with the plain Postgres message.
+                    reason = e.orig.__cause__ or e.orig
+                    errors.append({"index": index, "errors": [{"msg": str(reason)}]})
+
+        await session.commit()
+        return created
+
     async def update_book(
         self, session: AsyncSession, book_id, updated_book: BookUpdateModel
     ):
-        book_to_update = await self.get_book(session, book_id)
-
-        if book_to_update is not None:
-            for key, value in updated_book.model_dump().items():
-                setattr(book_to_update, key, value)
+        statement = (
+            update(Book)
+            .where(Book.uid == book_id)
+            .values(**updated_book.model_dump(), updated_at=datetime.now())
+            .returning(Book)
+        )
+        result = await session.execute(statement)
+        updated = result.scalar_one_or_none()
+        await session.commit()
 
-            # session.add(book_to_update)
-            await session.commit()
-            await session.refresh(book_to_update)
-            return book_to_update
+        if updated is not None:
+            await invalidate_book(updated.uid)
 
-        return None
+        return updated
 
     async def delete_book(self, session: AsyncSession, book_id):
-        book_to_delete = await self.get_book(session, book_id)
+        """Delete a book and its reviews in one statement, returning its uid."""
+        deleted_reviews = (
+            delete(Review).where(Review.book_id == book_id).cte("deleted_reviews")
+        )
+        statement = (
+            delete(Book)
+            .where(Book.uid == book_id)
+            .add_cte(deleted_reviews)
+            .returning(Book.uid)
+        )
+        result = await session.execute(statement)
+        deleted_uid = result.scalar_one_or_none()
+        await session.commit()
 
-        if book_to_delete is not None:
-            await session.delete(book_to_delete)
-            await session.commit()
+        if deleted_uid is not None:
+            await invalidate_book(deleted_uid)
 
-        else:
-            return None
+        return deleted_uid
@@ -0,0 +1,88 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given validator values."""
+    digest = hashlib.sha1(
+        "|".join(
+            part.isoformat() if isinstance(part, datetime) else str(part)
+            for part in parts
+        ).encode()
+    ).hexdigest()
+
+    return f'"{digest}"'
+
+
+def book_etag(
+    uid: Any, updated_at: datetime, review_count: int, last_review_at: Optional[datetime]
+) -> str:
+    return make_etag(uid, updated_at, review_count, last_review_at)
+
+
+def page_etag(items: Iterable[Any], next_cursor: Optional[str]) -> str:
+    """ETag of a book page; ``items`` may be ORM books or validator rows."""
+    parts = [
+        f"{item.uid}:{item.updated_at.isoformat()}:{item.review_count}"
+        for item in items
+    ]
+    return make_etag(*parts, next_cursor)
+
+
+def to_utc(value: datetime) -> datetime:
+    # Timestamps are stored naive in server local time
+    return value.astimezone(timezone.utc)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    return to_utc(last_modified).replace(microsecond=0) <= since
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return (
+        "if-none-match" in request.headers or "if-modified-since" in request.headers
+    )
+
+
+def set_validator_headers(
+    response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            to_utc(last_modified), usegmt=True
+        )
+
+
+def not_modified_response(
+    etag: str, last_modified: Optional[datetime] = None
+) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validator_headers(response, etag, last_modified)
+    return response
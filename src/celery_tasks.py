@@ -2,8 +2,11 @@ from typing import List
 
 from asgiref.sync import async_to_sync
 from celery import Celery
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
-from src.mail import create_message, mail
+from src.config import Config
+from src.mail import create_message, get_mail
 
 app = Celery()
 
@@ -15,13 +18,44 @@ app.config_from_object("src.config")
 #   celery -A src.celery_tasks.app flower --port=5555
 
 
-@app.task()
+# acks_late keeps the message on the broker until the task finishes, so a
+# worker crash mid-send redelivers it instead of losing it.
+@app.task(
+    acks_late=True,
+    ignore_result=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=8,
+)
 def send_email(recipients: List[str], subject: str, body: str):
-    """Sends an email asynchronously using Celery."""
+    """Sends an email asynchronously using Celery, retrying SMTP failures."""
     message = create_message(
         recipients=recipients,
         subject=subject,
         body=body,
     )
 
-    async_to_sync(mail.send_message)(message)
+    async_to_sync(get_mail().send_message)(message)
+
+
+async def _relay_with_worker_engine():
+    # Imported here: src.outbox publishes send_email from this module
+    from src.outbox import relay_pending_mail
+
+    # Every async_to_sync call runs on a fresh event loop, so the worker
+    # cannot share the pooled engine of the web app; this one is disposed on
+    # the loop that used it.
+    worker_engine = create_async_engine(Config.DATABASE_URL, poolclass=NullPool)
+    try:
+        await relay_pending_mail(
+            async_sessionmaker(worker_engine, expire_on_commit=False)
+        )
+    finally:
+        await worker_engine.dispose()
+
+
+@app.task()
+def relay_mail_outbox_task():
+    """Hands mail left in the outbox (e.g. while the broker was down) to send_email."""
+    async_to_sync(_relay_with_worker_engine)()
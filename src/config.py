@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import List, Literal
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -8,6 +9,28 @@ BASE_DIR = Path(__file__).resolve().parent
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Per-connection cache of prepared statements kept by SQLAlchemy's
+    # asyncpg dialect
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Behind PgBouncer in transaction pooling mode: no statement caches and a
+    # unique name per prepared statement, so connections never see another
+    # client's statements
+    DB_PGBOUNCER: bool = False
+    # JSON list of read replica URLs, e.g. '["postgresql+asyncpg://..."]'
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_CONNECT_TIMEOUT_SECONDS: float = 2
+    REPLICA_RETRY_SECONDS: int = 10
+    # How long a client reads from the primary after one of its writes
+    READ_YOUR_WRITES_SECONDS: int = 5
+    # "warn" logs, "raise" fails the request (for tests) when one statement
+    # repeats SQL_N_PLUS_ONE_THRESHOLD times in a request
+    SQL_N_PLUS_ONE_MODE: Literal["off", "warn", "raise"] = "off"
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
     REDIS_URL: str = "redis://localhost:6379/0"
     MAIL_USERNAME: str
     MAIL_PASSWORD: SecretStr
@@ -16,6 +39,21 @@ class Settings(BaseSettings):
     MAIL_SERVER: str
     MAIL_FROM_NAME: str
     DOMAIN: str
+    BOOK_CACHE_TTL_SECONDS: int = 300
+    PASSWORD_HASH_CONCURRENCY: int = 4
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10_000
+    PRINCIPAL_LOCAL_TTL_SECONDS: int = 30
+    PRINCIPAL_REDIS_TTL_SECONDS: int = 300
+    PRINCIPAL_LOCAL_CACHE_SIZE: int = 10_000
+    TOKEN_BLOCKLIST_RESYNC_SECONDS: int = 30
+    TOKEN_GENERATION_CACHE_SIZE: int = 10_000
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_LOGIN_PER_IP: int = 20
+    RATE_LIMIT_LOGIN_PER_EMAIL: int = 5
+    RATE_LIMIT_SIGNUP_PER_IP: int = 5
+    RATE_LIMIT_PASSWORD_RESET_PER_IP: int = 5
+    RATE_LIMIT_PASSWORD_RESET_PER_EMAIL: int = 3
+    RATE_LIMIT_REDIS_TIMEOUT_SECONDS: float = 0.05
 
     model_config = SettingsConfigDict(env_file=str(BASE_DIR / ".env"), extra="ignore")
 
@@ -27,3 +65,12 @@ Config = Settings()  # pyright: ignore[reportCallIssue]
 broker_url = Config.REDIS_URL
 result_backend = Config.REDIS_URL
 broker_connection_retry_on_startup = True
+
+# Relays mail left in the outbox while the broker was unreachable; run
+#   celery -A src.celery_tasks.app beat --loglevel=info
+beat_schedule = {
+    "relay-mail-outbox": {
+        "task": "src.celery_tasks.relay_mail_outbox_task",
+        "schedule": 60.0,
+    },
+}
@@ -0,0 +1,123 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Bind parameters and the expanded IN lists of selectin loads differ between
+# otherwise identical statements; both are folded before comparing.
+_PARAMETER = re.compile(r"\$\d+(::[A-Z_]+(\[\])?)?|%\(\w+\)s|\?")
+_PARAMETER_LIST = re.compile(r"\(\?(, \?)*\)")
+
+
+class NPlusOneQueryError(Exception):
+    """Raised in "raise" mode when a request repeats a statement too often."""
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _PARAMETER.sub("?", statement)
+    statement = _PARAMETER_LIST.sub("(?)", statement)
+    return " ".join(statement.split())
+
+
+class QueryStats:
+    """
+    Statements issued while a ``track_queries`` block is active.
+
+    Blocks nest (a test around a request around its queries); every
+    statement is also recorded on the enclosing block's stats.
+    """
+
+    def __init__(
+        self, parent: Optional["QueryStats"] = None, detect_n_plus_one: bool = False
+    ):
+        self.parent = parent
+        self.detect_n_plus_one = detect_n_plus_one
+        self.count = 0
+        self.duration_ms = 0.0
+        self.executed: List[str] = []
+        self.statements: Counter = Counter()
+        self.repeated: set = set()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.executed.append(statement)
+
+        if self.parent is not None:
+            self.parent.record(statement, duration_ms)
+
+        if not self.detect_n_plus_one or Config.SQL_N_PLUS_ONE_MODE == "off":
+            return
+
+        normalized = normalize_statement(statement)
+        self.statements[normalized] += 1
+        if (
+            self.statements[normalized] < Config.SQL_N_PLUS_ONE_THRESHOLD
+            or normalized in self.repeated
+        ):
+            return
+
+        self.repeated.add(normalized)
+        message = (
+            f"Possible N+1: statement ran {self.statements[normalized]} times "
+            f"in one request: {normalized}"
+        )
+        if Config.SQL_N_PLUS_ONE_MODE == "raise":
+            raise NPlusOneQueryError(message)
+        logger.warning(message)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration_ms:.1f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "bookly_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries(detect_n_plus_one: bool = False) -> Iterator[QueryStats]:
+    """Count and time every statement run in this context, on any engine."""
+    stats = QueryStats(_current_stats.get(), detect_n_plus_one)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# Listening on Engine covers the primary, the replicas and any engine built
+# in tests; outside track_queries the hooks return straight away.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+
+    stats.record(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for a failed statement
+    conn = exception_context.connection
+    started = conn.info.get("query_started_at") if conn is not None else None
+    if started:
+        started.pop()
@@ -1,9 +1,182 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import logging
+import time
+import uuid
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel
 
 from src.config import Config
+from src.db.redis import are_reads_pinned
+from src.metrics import (
+    DB_POOL_CAPACITY,
+    DB_POOL_ACQUIRE_SECONDS,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CONNECTIONS_OPENED,
+    DB_READ_SESSIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Set by the middleware after a request that committed, see get_session
+READ_PRIMARY_COOKIE = "bookly_read_primary"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each acquisition takes.
+
+    The time covers the whole of Pool.connect(): waiting for a free
+    connection, opening a new one and the pre-ping. Compare it with
+    DB_POOL_CONNECTIONS_OPENED to tell pool exhaustion from slow connects.
+    """
+
+    def connect(self):
+        try:
+            with DB_POOL_ACQUIRE_SECONDS.time():
+                return super().connect()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+
+
+def _statement_cache_args() -> dict:
+    if Config.DB_PGBOUNCER:
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    return {"prepared_statement_cache_size": Config.DB_PREPARED_STATEMENT_CACHE_SIZE}
+
+
+def _create_engine(url: str, **connect_args) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=Config.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args={**_statement_cache_args(), **connect_args},
+    )
+    event.listen(
+        engine.sync_engine, "connect", lambda *_: DB_POOL_CONNECTIONS_OPENED.inc()
+    )
+
+    return engine
+
+
+engine = _create_engine(Config.DATABASE_URL)
+
+async_session_factory = async_sessionmaker(
+    bind=engine, class_=AsyncSession, expire_on_commit=False
+)
+
+DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+DB_POOL_CAPACITY.set(Config.DB_POOL_SIZE + Config.DB_MAX_OVERFLOW)
+
+
+class ReplicaSet:
+    """
+    Round-robin over read replicas, skipping ones that recently failed.
+
+    A replica that cannot hand out a connection is left out for
+    REPLICA_RETRY_SECONDS; when none is usable the caller falls back to the
+    primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.engines = [
+            _create_engine(url, timeout=Config.REPLICA_CONNECT_TIMEOUT_SECONDS)
+            for url in urls
+        ]
+        self.session_factories = [
+            async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self._down_until = [0.0] * len(urls)
+        self._next = 0
+
+    async def open_session(self) -> Optional[AsyncSession]:
+        count = len(self.session_factories)
+        if count == 0:
+            return None
+
+        start = self._next
+        self._next = (start + 1) % count
+
+        for offset in range(count):
+            index = (start + offset) % count
+            if self._down_until[index] > time.monotonic():
+                continue
 
-engine = create_async_engine(Config.DATABASE_URL)
+            session = self.session_factories[index]()
+            try:
+                # Checks out (and pre-pings) a connection up front, so a dead
+                # replica is detected here rather than mid-request.
+                await session.connection()
+                return session
+            except (OSError, DBAPIError, PoolTimeoutError, asyncio.TimeoutError) as e:
+                await session.close()
+                self._down_until[index] = time.monotonic() + Config.REPLICA_RETRY_SECONDS
+                logger.warning(f"Read replica {index} unavailable: {e}")
+
+        return None
+
+
+replicas = ReplicaSet(Config.DATABASE_REPLICA_URLS)
+
+
+async def _warm_pool(engine: AsyncEngine, size: int) -> None:
+    # Held open together, or the pool would hand back the same one each time
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(size)), return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+
+    if errors:
+        logger.warning(
+            f"Opened {size - len(errors)}/{size} connections to {engine.url!r}: "
+            f"{errors[0]}"
+        )
+
+
+async def warm_pools() -> None:
+    """
+    Open DB_POOL_SIZE connections to the primary and to each replica.
+
+    Run at startup so the first requests a new worker serves do not pay for
+    the connection handshakes. Failures are logged, not raised: the pools
+    connect on demand as before.
+    """
+    await asyncio.gather(
+        _warm_pool(engine, Config.DB_POOL_SIZE),
+        *(_warm_pool(replica, Config.DB_POOL_SIZE) for replica in replicas.engines),
+    )
+
+
+async def close_pools() -> None:
+    await asyncio.gather(
+        engine.dispose(), *(replica.dispose() for replica in replicas.engines)
+    )
 
 
 async def init_db():
@@ -17,10 +190,49 @@ async def init_db():
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def get_session():
-    async_session = async_sessionmaker(
-        bind=engine, class_=AsyncSession, expire_on_commit=False
-    )
+async def get_session(request: Request):
+    async with async_session_factory() as session:
+        # Lets the middleware pin this client's next reads to the primary
+        @event.listens_for(session.sync_session, "after_commit")
+        def mark_committed(_):
+            request.state.db_committed = True
+
+        yield session
+
+
+async def _reads_pinned(request: Request) -> bool:
+    # Without replicas every read is on the primary; skip the Redis lookup
+    if not replicas.session_factories:
+        return False
+    if READ_PRIMARY_COOKIE in request.cookies:
+        return True
+
+    # Set by the bearer dependencies, which these routes resolve first
+    token_data = getattr(request.state, "token_data", None)
+    if token_data is None:
+        return False
+
+    return await are_reads_pinned(token_data["user"]["uid"])
+
+
+async def get_read_session(request: Request):
+    """
+    Session for read-only routes, on a replica when one is available.
+
+    A user who committed a write within READ_YOUR_WRITES_SECONDS keeps
+    reading from the primary, so they see their own writes despite
+    replication lag. The pin is kept per user in Redis for bearer-token
+    clients, and as READ_PRIMARY_COOKIE for clients that send cookies.
+    """
+    session = None
+    if not await _reads_pinned(request):
+        session = await replicas.open_session()
+
+    if session is None:
+        DB_READ_SESSIONS.labels(target="primary").inc()
+        session = async_session_factory()
+    else:
+        DB_READ_SESSIONS.labels(target="replica").inc()
 
-    async with async_session() as session:
+    async with session:
         yield session
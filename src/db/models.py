@@ -4,9 +4,36 @@ from datetime import datetime
 from typing import Optional,List
 
 import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import Computed, Index, text
+from sqlalchemy.orm import deferred
 from sqlmodel import Column, Field, Relationship, SQLModel
 
+BOOK_SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('english', "
+    "coalesce(title, '') || ' ' || coalesce(author, '') || ' ' || coalesce(publisher, ''))"
+)
+
+
+# Only ever filtered and ranked on, never returned, so it is deferred and
+# left out of select(Book) and of INSERT/UPDATE ... RETURNING.
+BOOK_SEARCH_VECTOR_COLUMN = Column(
+    "search_vector",
+    pg.TSVECTOR,
+    Computed(BOOK_SEARCH_VECTOR_EXPRESSION, persisted=True),
+)
+
+
 class Book(SQLModel, table=True):
+    __mapper_args__ = {
+        "properties": {"search_vector": deferred(BOOK_SEARCH_VECTOR_COLUMN)}
+    }
+    __table_args__ = (
+        # Keyset pagination indexes, see src/db/pagination.py
+        Index("ix_book_created_at_uid", "created_at", "uid"),
+        Index("ix_book_user_id_created_at_uid", "user_id", "created_at", "uid"),
+        Index("ix_book_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     uid: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=256)
     author: str
@@ -21,9 +48,18 @@ class Book(SQLModel, table=True):
     updated_at: datetime = Field(
         default_factory=datetime.now, sa_column=Column(pg.TIMESTAMP)
     )
+    # Maintained by ReviewService in the same transaction as the review rows
+    review_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_sum: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Maintained by Postgres, used by BookService.search_books
+    search_vector: Optional[str] = Field(
+        default=None, exclude=True, sa_column=BOOK_SEARCH_VECTOR_COLUMN
+    )
     
     user: Optional["User"] = Relationship(back_populates="books")
-    reviews: List["Review"] = Relationship(back_populates="book",sa_relationship_kwargs={"lazy":"selectin"})
+    # Collections are never loaded implicitly; services opt in per query
+    # with selectinload() where the response actually needs them.
+    reviews: List["Review"] = Relationship(back_populates="book",sa_relationship_kwargs={"lazy":"raise"})
 
 
     def __repr__(self):
@@ -33,7 +69,7 @@ class Book(SQLModel, table=True):
 # User Model
 class User(SQLModel, table=True):
     uid: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, nullable=False)
-    email: str
+    email: str = Field(unique=True, index=True)
     username: str
     first_name: str
     last_name: str
@@ -43,8 +79,8 @@ class User(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
-    books: List["Book"] = Relationship(back_populates="user",sa_relationship_kwargs={"lazy":"selectin"})
-    reviews: List["Review"] = Relationship(back_populates="user",sa_relationship_kwargs={"lazy":"selectin"})
+    books: List["Book"] = Relationship(back_populates="user",sa_relationship_kwargs={"lazy":"raise"})
+    reviews: List["Review"] = Relationship(back_populates="user",sa_relationship_kwargs={"lazy":"raise"})
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -52,8 +88,13 @@ class User(SQLModel, table=True):
 
 # Review Model
 class Review(SQLModel, table=True):
+    __table_args__ = (
+        # Keyset pagination of a user's reviews; also serves user_id lookups
+        Index("ix_review_user_id_created_at_uid", "user_id", "created_at", "uid"),
+    )
+
     uid: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    book_id: uuid.UUID = Field(foreign_key="book.uid")
+    book_id: uuid.UUID = Field(foreign_key="book.uid", index=True)
     user_id: uuid.UUID = Field(foreign_key="user.uid")
     rating: int = Field(ge=1, le=5)
     comment: Optional[str] = None
@@ -65,4 +106,29 @@ class Review(SQLModel, table=True):
 
 
     def __repr__(self):
-        return f"<Review {self.uid} - Book {self.book_id} by User {self.user_id}>"  
\ No newline at end of file
+        return f"<Review {self.uid} - Book {self.book_id} by User {self.user_id}>"  
+
+
+# Mail Outbox Model
+class MailOutbox(SQLModel, table=True):
+    """Mail committed with the write that caused it, relayed to Celery later."""
+
+    __tablename__ = "mail_outbox"
+    __table_args__ = (
+        # Only undispatched rows are scanned by the relay
+        Index(
+            "ix_mail_outbox_pending",
+            "created_at",
+            postgresql_where=text("dispatched_at IS NULL"),
+        ),
+    )
+
+    uid: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    recipients: List[str] = Field(sa_column=Column(pg.ARRAY(pg.VARCHAR), nullable=False))
+    subject: str
+    body: str
+    created_at: datetime = Field(default_factory=datetime.now)
+    dispatched_at: Optional[datetime] = None
+
+    def __repr__(self):
+        return f"<MailOutbox {self.uid} - {self.subject}>"
@@ -0,0 +1,72 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List, Sequence, Tuple
+
+from src.errors import InvalidCursorException
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else str(value)
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+    if not isinstance(payload, list):
+        raise InvalidCursorException()
+
+    return payload
+
+
+def decode_created_at_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced for a ``(created_at, uid)`` keyset."""
+    values = decode_cursor(cursor)
+
+    try:
+        created_at, uid = values
+        return datetime.fromisoformat(created_at), uuid.UUID(uid)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, uuid.UUID]:
+    """Decode a cursor produced for a ``(rank, uid)`` keyset."""
+    values = decode_cursor(cursor)
+
+    try:
+        rank, uid = values
+        return float(rank), uuid.UUID(uid)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def build_page(rows: Sequence[Any], limit: int, key: Callable[[Any], Tuple]):
+    """
+    Split a ``limit + 1`` result into the page items and the next cursor.
+
+    Services fetch one row more than requested; if it comes back there is a
+    next page, and its cursor is built from ``key`` of the last returned item.
+    """
+    items = list(rows[:limit])
+    next_cursor = None
+
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(*key(items[-1]))
+
+    return items, next_cursor
@@ -1,16 +1,252 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 
 from src.config import Config
 
-JTI_EXPIRATION_SECONDS = 3600  # 1 hour
+logger = logging.getLogger(__name__)
+
+# Revocations are announced on a channel and indexed in a sorted set
+# (jti -> unix expiry) so a worker can load the current set when it starts.
+BLOCKLIST_CHANNEL = "token_blocklist:revoked"
+BLOCKLIST_INDEX_KEY = "token_blocklist:index"
+BLOCKLIST_RETRY_SECONDS = 1
+
+# Before the index existed a revoked JTI was only a plain key (jti -> "")
+# expiring with the token. Those are copied into the index once; the marker
+# records that it was done so later workers skip the scan.
+BLOCKLIST_BACKFILLED_KEY = "token_blocklist:backfilled"
+LEGACY_JTI_PATTERN = "????????-????-????-????-????????????"
+
+# One counter per user; tokens carry the value current when they were
+# issued and any token with a lower one is revoked. The key never expires:
+# once gone, the next bump would restart at 1 and tokens issued at 1 would
+# survive it.
+TOKEN_GENERATION_KEY_PREFIX = "token_generation:"
+TOKEN_GENERATION_CHANNEL = "token_generation:bumped"
+
+# Users whose reads stay on the primary for READ_YOUR_WRITES_SECONDS after
+# they committed a write, so replica lag never hides it from them.
+READ_PRIMARY_KEY_PREFIX = "read_primary:"
+
+_redis_client: Optional[redis.Redis] = None
+
+# Local copies of the blocklist and of token generations. While the
+# listener is subscribed and has loaded the index, a JTI missing here is not
+# revoked and a cached generation is current, so both are answered without
+# a round trip; otherwise lookups fall back to Redis.
+_revoked_jtis: Dict[str, float] = {}
+_token_generations: "OrderedDict[str, int]" = OrderedDict()
+_blocklist_synced = False
+_blocklist_listener: Optional[asyncio.Task] = None
+
 
-token_blocklist_redis = redis.from_url(Config.REDIS_URL, decode_responses=True)
+def get_redis() -> redis.Redis:
+    """The shared client, created on first use rather than at import."""
+    global _redis_client
 
+    if _redis_client is None:
+        _redis_client = redis.from_url(Config.REDIS_URL, decode_responses=True)
+    return _redis_client
 
-async def add_token_to_blocklist(jti: str):
-    await token_blocklist_redis.set(name=jti, value="", ex=JTI_EXPIRATION_SECONDS)
+
+def token_generation_key(user_id: str) -> str:
+    return f"{TOKEN_GENERATION_KEY_PREFIX}{user_id}"
+
+
+async def add_token_to_blocklist(jti: str, expires_at: float):
+    """Revoke a single token until its own ``exp``."""
+    ttl = max(1, math.ceil(expires_at - time.time()))
+
+    async with get_redis().pipeline(transaction=True) as pipe:
+        pipe.set(name=jti, value="", ex=ttl)
+        pipe.zadd(BLOCKLIST_INDEX_KEY, {jti: expires_at})
+        pipe.zremrangebyscore(BLOCKLIST_INDEX_KEY, "-inf", time.time())
+        pipe.publish(BLOCKLIST_CHANNEL, f"{jti} {expires_at}")
+        await pipe.execute()
+
+    _revoked_jtis[jti] = expires_at
 
 
 async def is_token_blocked(jti: str) -> bool:
-    is_blocked = await token_blocklist_redis.get(jti)
+    _ensure_blocklist_listener()
+
+    expires_at = _revoked_jtis.get(jti)
+    if expires_at is not None:
+        if expires_at > time.time():
+            return True
+        _revoked_jtis.pop(jti, None)
+
+    if _blocklist_synced:
+        return False
+
+    is_blocked = await get_redis().get(jti)
     return is_blocked is not None
+
+
+def _cache_generation(user_id: str, generation: int) -> None:
+    # A slow fetch can finish after a bump; never move a generation backwards
+    generation = max(generation, _token_generations.get(user_id, 0))
+    _token_generations[user_id] = generation
+    _token_generations.move_to_end(user_id)
+
+    if len(_token_generations) > Config.TOKEN_GENERATION_CACHE_SIZE:
+        _token_generations.popitem(last=False)
+
+
+async def get_token_generation(user_id: str, fresh: bool = False) -> int:
+    """
+    Current token generation of a user.
+
+    ``fresh`` skips the local copy; use it when issuing tokens so a new token
+    is never stamped with a generation another worker already revoked.
+    """
+    _ensure_blocklist_listener()
+
+    if not fresh and _blocklist_synced and user_id in _token_generations:
+        _token_generations.move_to_end(user_id)
+        return _token_generations[user_id]
+
+    generation = int(await get_redis().get(token_generation_key(user_id)) or 0)
+    if _blocklist_synced:
+        _cache_generation(user_id, generation)
+
+    return generation
+
+
+async def bump_token_generation(user_id: str) -> int:
+    """Revoke every token issued to the user so far."""
+    async with get_redis().pipeline(transaction=True) as pipe:
+        pipe.incr(token_generation_key(user_id))
+        pipe.publish(TOKEN_GENERATION_CHANNEL, user_id)
+        generation, _ = await pipe.execute()
+
+    _cache_generation(user_id, generation)
+    return generation
+
+
+async def pin_reads_to_primary(user_id: str) -> None:
+    try:
+        await get_redis().set(
+            f"{READ_PRIMARY_KEY_PREFIX}{user_id}",
+            "",
+            ex=Config.READ_YOUR_WRITES_SECONDS,
+        )
+    except RedisError as e:
+        logger.warning(f"Could not pin reads to the primary: {e}")
+
+
+async def are_reads_pinned(user_id: str) -> bool:
+    try:
+        return bool(await get_redis().exists(f"{READ_PRIMARY_KEY_PREFIX}{user_id}"))
+    except RedisError as e:
+        # The replica may lag; the cookie still covers browser clients
+        logger.warning(f"Could not check the read pin: {e}")
+        return False
+
+
+def _ensure_blocklist_listener() -> None:
+    global _blocklist_listener
+
+    if _blocklist_listener is None or _blocklist_listener.done():
+        _blocklist_listener = asyncio.create_task(_listen_for_revocations())
+
+
+async def stop_blocklist_listener() -> None:
+    """Cancel the listener and wait for it to unsubscribe; run on shutdown."""
+    global _blocklist_listener, _blocklist_synced
+
+    listener, _blocklist_listener = _blocklist_listener, None
+    if listener is not None:
+        listener.cancel()
+        try:
+            await listener
+        except asyncio.CancelledError:
+            pass
+
+    _blocklist_synced = False
+
+
+async def _backfill_blocklist_index() -> None:
+    client = get_redis()
+    if await client.exists(BLOCKLIST_BACKFILLED_KEY):
+        return
+
+    # Every worker that starts before the marker is set scans too, so none
+    # of them reports synced while missing a revocation; ZADD is idempotent.
+    async for jti in client.scan_iter(match=LEGACY_JTI_PATTERN, count=1000):
+        ttl = await client.ttl(jti)
+        if ttl > 0:
+            await client.zadd(BLOCKLIST_INDEX_KEY, {jti: time.time() + ttl})
+
+    await client.set(BLOCKLIST_BACKFILLED_KEY, "")
+
+
+async def _load_blocklist() -> None:
+    global _revoked_jtis
+
+    entries = await get_redis().zrangebyscore(
+        BLOCKLIST_INDEX_KEY, time.time(), "+inf", withscores=True
+    )
+    _revoked_jtis = {jti: expires_at for jti, expires_at in entries}
+    # Generations are fetched on demand; drop any that may have missed a bump
+    _token_generations.clear()
+
+
+def _apply_message(message: dict) -> None:
+    if message["channel"] == BLOCKLIST_CHANNEL:
+        jti, expires_at = message["data"].rsplit(" ", 1)
+        _revoked_jtis[jti] = float(expires_at)
+    else:
+        # Refetched on next use rather than trusting message order
+        _token_generations.pop(message["data"], None)
+
+
+async def _listen_for_revocations() -> None:
+    """
+    Keep the local blocklist and token generations in sync with Redis.
+
+    The index is reloaded right after subscribing, so nothing published in
+    between is lost, and again every TOKEN_BLOCKLIST_RESYNC_SECONDS, which
+    bounds how long a dropped pub/sub message can go unnoticed.
+    """
+    global _blocklist_synced
+
+    while True:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(BLOCKLIST_CHANNEL, TOKEN_GENERATION_CHANNEL)
+            await _backfill_blocklist_index()
+            await _load_blocklist()
+            _blocklist_synced = True
+            synced_at = time.monotonic()
+
+            while True:
+                message = await pubsub.get_message(
+                    timeout=Config.TOKEN_BLOCKLIST_RESYNC_SECONDS
+                )
+                if message is not None:
+                    try:
+                        _apply_message(message)
+                    except (AttributeError, TypeError, ValueError) as e:
+                        # The next resync restores whatever it announced
+                        logger.warning(f"Ignoring malformed message {message!r}: {e}")
+
+                if time.monotonic() - synced_at >= Config.TOKEN_BLOCKLIST_RESYNC_SECONDS:
+                    await _load_blocklist()
+                    synced_at = time.monotonic()
+
+        except RedisError as e:
+            logger.warning(f"Token blocklist listener disconnected: {e}")
+
+        finally:
+            _blocklist_synced = False
+            await pubsub.aclose()
+
+        await asyncio.sleep(BLOCKLIST_RETRY_SECONDS)
@@ -62,6 +62,20 @@ class AccountNotVerifiedException(BooklyException):
     pass
 
 
+class InvalidCursorException(BooklyException):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+class RateLimitExceededException(BooklyException):
+    """Exception raised when a client exceeds a rate limit."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
 def create_exception_handler(
     status_code: int, initial_details: Any
 ) -> Callable[[Request, Exception], Coroutine[Any, Any, JSONResponse]]:
@@ -138,6 +152,14 @@ def register_all_error_handlers(app: FastAPI) -> None:
                 "resolution": "Please verify your email to activate your account.",
             },
         },
+        {
+            "exception": InvalidCursorException,
+            "status_code": status.HTTP_400_BAD_REQUEST,
+            "details": {
+                "message": "Pagination cursor is invalid",
+                "error_code": "INVALID_CURSOR",
+            },
+        },
     ]
 
     # Register all exception handlers
@@ -150,6 +172,19 @@ def register_all_error_handlers(app: FastAPI) -> None:
             ),
         )
 
+    @app.exception_handler(RateLimitExceededException)
+    async def rate_limit_exceeded_handler(
+        request: Request, exc: RateLimitExceededException
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "message": "Too many requests, please try again later",
+                "error_code": "RATE_LIMIT_EXCEEDED",
+            },
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     # Register internal server error handler
     @app.exception_handler(500)
     async def internal_server_error_handler(
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from fastapi_mail import (
     ConnectionConfig,
@@ -14,20 +14,29 @@ from src.config import Config
 BASE_DIR = Path(__file__).resolve().parent
 
 
-mail_conf = ConnectionConfig(
-    MAIL_USERNAME=Config.MAIL_USERNAME,
-    MAIL_PASSWORD=Config.MAIL_PASSWORD,
-    MAIL_FROM=Config.MAIL_FROM,
-    MAIL_PORT=Config.MAIL_PORT,
-    MAIL_SERVER=Config.MAIL_SERVER,
-    MAIL_FROM_NAME=Config.MAIL_FROM_NAME,
-    MAIL_STARTTLS=True,
-    MAIL_SSL_TLS=False,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True,
-)
-
-mail = FastMail(mail_conf)
+_mail: Optional[FastMail] = None
+
+
+def get_mail() -> FastMail:
+    """The SMTP client, built on first send rather than when a worker imports it."""
+    global _mail
+
+    if _mail is None:
+        _mail = FastMail(
+            ConnectionConfig(
+                MAIL_USERNAME=Config.MAIL_USERNAME,
+                MAIL_PASSWORD=Config.MAIL_PASSWORD,
+                MAIL_FROM=Config.MAIL_FROM,
+                MAIL_PORT=Config.MAIL_PORT,
+                MAIL_SERVER=Config.MAIL_SERVER,
+                MAIL_FROM_NAME=Config.MAIL_FROM_NAME,
+                MAIL_STARTTLS=True,
+                MAIL_SSL_TLS=False,
+                USE_CREDENTIALS=True,
+                VALIDATE_CERTS=True,
+            )
+        )
+    return _mail
 
 
 def create_message(subject: str, recipients: List[str], body: str):
@@ -0,0 +1,58 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+BOOK_CACHE_HITS = Counter(
+    "bookly_book_cache_hits_total", "Book detail lookups served from Redis"
+)
+BOOK_CACHE_MISSES = Counter(
+    "bookly_book_cache_misses_total", "Book detail lookups that fell through to Postgres"
+)
+BOOK_CACHE_ERRORS = Counter(
+    "bookly_book_cache_errors_total", "Book detail cache operations that failed"
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "bookly_password_hash_queue_depth",
+    "bcrypt hash/verify calls waiting for or running on the hashing pool",
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "bookly_password_hash_seconds",
+    "Time spent in bcrypt hash/verify on a worker thread",
+)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "bookly_rate_limit_rejections_total",
+    "Requests rejected by a rate limiter",
+    ["scope"],
+)
+RATE_LIMIT_FALLBACKS = Counter(
+    "bookly_rate_limit_fallbacks_total",
+    "Rate limit checks answered locally because Redis failed or was slow",
+)
+
+DB_POOL_ACQUIRE_SECONDS = Histogram(
+    "bookly_db_pool_acquire_seconds",
+    "Time to get a connection from the database pool: waiting for a free one, "
+    "opening a new one and the pre-ping all count",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CONNECTIONS_OPENED = Counter(
+    "bookly_db_pool_connections_opened_total",
+    "New database connections opened by the pool; acquisitions that did not "
+    "open one were served from the pool or waited for it",
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "bookly_db_pool_checkout_timeouts_total",
+    "Pool checkouts that gave up after DB_POOL_TIMEOUT_SECONDS",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "bookly_db_pool_checked_out", "Database connections currently checked out"
+)
+DB_POOL_CAPACITY = Gauge(
+    "bookly_db_pool_capacity",
+    "Most connections the pool will open (pool_size + max_overflow)",
+)
+DB_READ_SESSIONS = Counter(
+    "bookly_db_read_sessions_total",
+    "Read-only sessions opened, by where they were routed",
+    ["target"],
+)
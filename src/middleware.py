@@ -4,6 +4,11 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 import time
 
+from src.config import Config
+from src.db.instrumentation import track_queries
+from src.db.main import READ_PRIMARY_COOKIE, replicas
+from src.db.redis import pin_reads_to_primary
+
 logger = logging.getLogger("uvicorn.access")
 logger.disabled = True
 
@@ -11,11 +16,13 @@ def register_all_middleware(app: FastAPI):
     @app.middleware("http")
     async def custom_logger_middleware(request, call_next):
         start_time = time.time()
-       
-        response = await call_next(request)
+
+        with track_queries(detect_n_plus_one=True) as queries:
+            response = await call_next(request)
 
         process_time = (time.time() - start_time) * 1000
         formatted_process_time = f"{process_time:.2f}ms"
+        response.headers["Server-Timing"] = queries.server_timing()
 
         status = getattr(response, "status_code", 0)
         if status >= 500:
@@ -37,11 +44,37 @@ def register_all_middleware(app: FastAPI):
             f"{emoji} {method_color}{request.method}{reset} "
             f"{url_color}{request.url.path}{reset} -> "
             f"{status_color}{status}{reset} "
-            f"completed in {time_color}{formatted_process_time}{reset} \n"
+            f"completed in {time_color}{formatted_process_time}{reset} "
+            f"({queries.count} queries, {queries.duration_ms:.2f}ms db) \n"
         )
 
         return response 
     
+    @app.middleware("http")
+    async def read_your_writes_middleware(request, call_next):
+        response = await call_next(request)
+
+        # Without replicas every read is on the primary already, see _reads_pinned
+        if not replicas.session_factories:
+            return response
+
+        # get_session flags requests that committed; pin the user's reads
+        # to the primary until replicas have caught up with the write.
+        if getattr(request.state, "db_committed", False):
+            token_data = getattr(request.state, "token_data", None)
+            if token_data is not None:
+                await pin_reads_to_primary(token_data["user"]["uid"])
+
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                "1",
+                max_age=Config.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax",
+            )
+
+        return response
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
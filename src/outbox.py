@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from src.db.main import async_session_factory
+from src.db.models import MailOutbox
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_RELAY_BATCH_SIZE = 100
+
+
+def enqueue_mail(
+    session: AsyncSession, recipients: List[str], subject: str, body: str
+) -> MailOutbox:
+    """
+    Stage a mail in the session's transaction.
+
+    Nothing is sent until the caller commits; the row is then handed to
+    Celery by ``relay_mail_outbox``.
+    """
+    message = MailOutbox(recipients=recipients, subject=subject, body=body)
+    session.add(message)
+
+    return message
+
+
+async def relay_mail_outbox(session: AsyncSession) -> int:
+    """Publish undispatched outbox rows to the ``send_email`` task."""
+    # Celery and its mail client load here, on the first relay, rather than
+    # when the web app is imported
+    from kombu.exceptions import OperationalError
+
+    from src.celery_tasks import send_email
+
+    statement = (
+        select(MailOutbox)
+        .where(MailOutbox.dispatched_at == None)  # noqa: E711
+        .order_by(MailOutbox.created_at)
+        .limit(OUTBOX_RELAY_BATCH_SIZE)
+        # Concurrent relays (other workers, Celery beat) take disjoint rows
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(statement)
+
+    relayed = 0
+    for message in result.scalars().all():
+        try:
+            # Publishing is blocking I/O; retry=False fails fast when the
+            # broker is down, the row is simply picked up by a later relay.
+            await asyncio.to_thread(
+                send_email.apply_async,
+                kwargs={
+                    "recipients": message.recipients,
+                    "subject": message.subject,
+                    "body": message.body,
+                },
+                retry=False,
+            )
+        except OperationalError as e:
+            logger.warning(f"Mail outbox relay stopped, broker unavailable: {e}")
+            break
+
+        message.dispatched_at = datetime.now()
+        relayed += 1
+
+    await session.commit()
+    return relayed
+
+
+async def relay_pending_mail(
+    session_factory: async_sessionmaker = async_session_factory,
+) -> None:
+    """Run a relay pass in its own session, e.g. as a background task."""
+    async with session_factory() as session:
+        await relay_mail_outbox(session)
@@ -1,9 +1,9 @@
 
 from fastapi import APIRouter, Depends
 from src.db.main import get_session
-from src.db.models import User
 from src.reviews.services import ReviewService
-from src.auth.dependencies import AccessTokenBearer, RoleChecker, get_current_user
+from src.auth.dependencies import AccessTokenBearer, RoleChecker, get_current_principal
+from src.auth.schemas import PrincipalModel
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from src.reviews.schemas import ReviewCreateModel
 
@@ -18,7 +18,7 @@ async def create_review(
         book_id:str,
         review_data:ReviewCreateModel,
         session: AsyncSession = Depends(get_session),
-        user_details: User = Depends(get_current_user)):
+        user_details: PrincipalModel = Depends(get_current_principal)):
     
     user_id = user_details.uid
     review = await router_service.add_review(session,user_id=user_id,book_id=book_id,review_data=review_data) 
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 import uuid
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ReviewModel(BaseModel):
@@ -15,3 +15,7 @@ class ReviewModel(BaseModel):
 class ReviewCreateModel(BaseModel):
     rating: int
     comment: Optional[str] = None
+
+class ReviewPage(BaseModel):
+    items: List[ReviewModel]
+    next_cursor: Optional[str] = None
@@ -1,9 +1,15 @@
+from typing import Optional
+
+from sqlalchemy import tuple_, update
+from sqlmodel import desc, select
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status
 from src.errors import BookNotFoundException
 from src.reviews.schemas import ReviewCreateModel
-from src.db.models import Review
+from src.db.models import Book, Review
+from src.books.cache import invalidate_book
 from src.books.service import BookService
+from src.db.pagination import DEFAULT_PAGE_SIZE, build_page, decode_created_at_cursor
 
 import uuid
 
@@ -11,6 +17,31 @@ import uuid
 book_service = BookService()
 
 class ReviewService:
+    async def get_user_reviews(
+        self,
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ):
+        statement = select(Review).where(Review.user_id == user_id)
+        if cursor:
+            created_at, uid = decode_created_at_cursor(cursor)
+            statement = statement.where(
+                tuple_(Review.created_at, Review.uid) < tuple_(created_at, uid)
+            )
+
+        statement = statement.order_by(desc(Review.created_at), desc(Review.uid)).limit(
+            limit + 1
+        )
+        result = await session.execute(statement)
+
+        return build_page(
+            result.scalars().all(),
+            limit,
+            key=lambda review: (review.created_at, review.uid),
+        )
+
     async def add_review(self,session:AsyncSession, user_id: uuid.UUID, book_id: str,review_data: ReviewCreateModel):
         try:
             book = await book_service.get_book(session, book_id)
@@ -26,8 +57,20 @@ class ReviewService:
 
             new_review = Review(**new_review_payload)
             session.add(new_review)
+
+            # Keep the denormalized aggregates on book in step with review
+            # rows; any future review update/delete must adjust them too.
+            await session.execute(
+                update(Book)
+                .where(Book.uid == book.uid)
+                .values(
+                    review_count=Book.review_count + 1,
+                    rating_sum=Book.rating_sum + review_data.rating,
+                )
+            )
             await session.commit()
             await session.refresh(new_review)
+            await invalidate_book(book.uid)
 
             return new_review
         
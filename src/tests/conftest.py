@@ -1,10 +1,34 @@
+import os
+from contextlib import contextmanager
 from unittest.mock import Mock
 
+import fakeredis.aioredis
+import httpx
 import pytest
+import redis.asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
 
-from src import app
-from src.db.main import get_session
+# Settings are read when src is imported: repeated statements fail the
+# request instead of logging. Redis is in-process.
+os.environ.setdefault("SQL_N_PLUS_ONE_MODE", "raise")
+fake_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+redis.asyncio.from_url = lambda *args, **kwargs: fake_redis
+
+from src import app  # noqa: E402
+from src.auth import cache as principal_cache  # noqa: E402
+from src.auth import rate_limit  # noqa: E402
+from src.auth import routes as auth_routes  # noqa: E402
+from src.db import redis as token_store  # noqa: E402
+from src.db.instrumentation import track_queries  # noqa: E402
+from src.db import main as db_main  # noqa: E402
+from src.db.main import get_read_session, get_session  # noqa: E402
+
+# Database-backed tests run against a disposable Postgres database, e.g.
+#   TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost/bookly_test
+# Its schema is dropped and recreated from the models on every run.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
 
 mock_session = Mock()
 mock_user_service = Mock()
@@ -31,3 +55,94 @@ def fake_user_service():
 def test_client():
     client = TestClient(app)
     return client
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def pg_engine(anyio_backend):
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail when the block runs more SQL statements than ``limit``.
+
+        with assert_max_queries(2):
+            await client.get("/api/v1/books/")
+    """
+
+    @contextmanager
+    def check(limit: int):
+        with track_queries() as queries:
+            yield queries
+
+        if queries.count > limit:
+            executed = "\n".join(
+                f"  {number}. {' '.join(statement.split())}"
+                for number, statement in enumerate(queries.executed, start=1)
+            )
+            pytest.fail(
+                f"Expected at most {limit} queries, {queries.count} ran:\n{executed}",
+                pytrace=False,
+            )
+
+    return check
+
+
+@pytest.fixture
+async def redis_store():
+    """The fake Redis, emptied, with the in-process caches in front of it."""
+    await fake_redis.flushall()
+    principal_cache._local_principals.clear()
+    rate_limit._local_windows.clear()
+    token_store._token_generations.clear()
+
+    yield fake_redis
+
+    await token_store.stop_blocklist_listener()
+
+
+@pytest.fixture
+async def db_client(pg_engine, redis_store, monkeypatch):
+    """
+    An HTTP client for the real app, with every session on the test database.
+
+    Redis state and the in-process caches in front of it start empty, so
+    each request pays its cold-path queries. Mail stays in the outbox.
+    """
+    session_factory = async_sessionmaker(
+        bind=pg_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def get_test_session():
+        async with session_factory() as session:
+            yield session
+
+    # The real get_session on the test factory, so commits reach the middleware
+    monkeypatch.delitem(app.dependency_overrides, get_session)
+    monkeypatch.setattr(db_main, "async_session_factory", session_factory)
+    monkeypatch.setitem(app.dependency_overrides, get_read_session, get_test_session)
+
+    async def keep_mail_in_outbox():
+        pass
+
+    monkeypatch.setattr(auth_routes, "relay_pending_mail", keep_mail_in_outbox)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
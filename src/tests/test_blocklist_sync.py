@@ -0,0 +1,34 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from src.db import redis as token_store
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_initial_sync_backfills_jtis_revoked_before_the_index(redis_store):
+    legacy_jti = str(uuid.uuid4())
+    await redis_store.set(legacy_jti, "", ex=600)
+    await redis_store.set("read_primary:someone", "", ex=600)
+
+    assert await token_store.is_token_blocked(legacy_jti)
+    # Wait for the listener to subscribe and load the index
+    for _ in range(100):
+        if token_store._blocklist_synced:
+            break
+        await asyncio.sleep(0.01)
+    assert token_store._blocklist_synced
+
+    assert legacy_jti in token_store._revoked_jtis
+    assert token_store._revoked_jtis[legacy_jti] > time.time()
+    assert await token_store.is_token_blocked(legacy_jti)
+    assert await redis_store.zrange(token_store.BLOCKLIST_INDEX_KEY, 0, -1) == [
+        legacy_jti
+    ]
+
+    await token_store.stop_blocklist_listener()
+    assert token_store._blocklist_listener is None
+    assert not token_store._blocklist_synced
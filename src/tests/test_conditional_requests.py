@@ -0,0 +1,141 @@
+"""
+Conditional GETs on book pages and book details.
+
+A client revalidating with the ETag or Last-Modified it was given gets a
+304 while nothing changed, and a 200 with a new ETag once something did.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.utils import create_access_token
+from src.db.models import Book, User
+
+pytestmark = pytest.mark.anyio
+
+BOOK = {
+    "title": "Conditional",
+    "author": "Author",
+    "publisher": "Publisher",
+    "publish_date": "2020",
+    "page_count": 100,
+    "language": "en",
+}
+
+
+@pytest.fixture
+async def owner(pg_engine):
+    """A user with one book, and an access token."""
+    suffix = uuid.uuid4().hex[:12]
+    user = User(
+        email=f"etag-{suffix}@example.com",
+        username=f"etag-{suffix}",
+        first_name="Etag",
+        last_name="Check",
+        hashed_password="unused",
+    )
+    book = Book(user_id=user.uid, **BOOK)
+
+    async with AsyncSession(pg_engine, expire_on_commit=False) as session:
+        session.add(user)
+        await session.flush()
+        session.add(book)
+        await session.commit()
+
+    token = create_access_token(
+        {"uid": str(user.uid), "email": user.email, "role": user.role}
+    )
+
+    return {
+        "headers": {"Authorization": f"Bearer {token}"},
+        "book_url": f"/api/v1/books/{book.uid}",
+        "page_url": f"/api/v1/books/user/{user.uid}",
+    }
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+async def revalidate(client, url, owner, **conditions):
+    return await client.get(url, headers={**owner["headers"], **conditions})
+
+
+@pytest.mark.parametrize("url_key", ["book_url", "page_url"])
+async def test_matching_etag_is_not_modified(db_client, owner, url_key):
+    url = owner[url_key]
+    etag = (await revalidate(db_client, url, owner)).headers["ETag"]
+
+    for if_none_match in [etag, f"W/{etag}", f'"stale", {etag}', "*"]:
+        response = await revalidate(
+            db_client, url, owner, **{"If-None-Match": if_none_match}
+        )
+
+        assert response.status_code == 304, if_none_match
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    response = await revalidate(db_client, url, owner, **{"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+async def test_if_modified_since_is_not_modified(db_client, owner):
+    url = owner["book_url"]
+    last_modified = (await revalidate(db_client, url, owner)).headers["Last-Modified"]
+
+    response = await revalidate(
+        db_client, url, owner, **{"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+    assert response.headers["Last-Modified"] == last_modified
+
+    earlier = http_date(datetime.now(timezone.utc) - timedelta(days=1))
+    response = await revalidate(db_client, url, owner, **{"If-Modified-Since": earlier})
+    assert response.status_code == 200
+
+
+async def test_if_none_match_takes_precedence_over_if_modified_since(db_client, owner):
+    url = owner["book_url"]
+    etag = (await revalidate(db_client, url, owner)).headers["ETag"]
+    earlier = http_date(datetime.now(timezone.utc) - timedelta(days=1))
+    later = http_date(datetime.now(timezone.utc) + timedelta(days=1))
+
+    # A stale ETag wins over a date that alone would mean not modified
+    response = await revalidate(
+        db_client,
+        url,
+        owner,
+        **{"If-None-Match": '"stale"', "If-Modified-Since": later},
+    )
+    assert response.status_code == 200
+
+    response = await revalidate(
+        db_client, url, owner, **{"If-None-Match": etag, "If-Modified-Since": earlier}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("url_key", ["book_url", "page_url"])
+async def test_change_returns_new_etag(db_client, owner, url_key):
+    url = owner[url_key]
+    etag = (await revalidate(db_client, url, owner)).headers["ETag"]
+
+    response = await db_client.patch(
+        owner["book_url"],
+        json={"title": "Renamed", "author": "Author", "publisher": "Publisher"},
+        headers=owner["headers"],
+    )
+    assert response.status_code == 200, response.text
+
+    response = await revalidate(db_client, url, owner, **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Renamed" in response.text
+
+    fresh = response.headers["ETag"]
+    response = await revalidate(db_client, url, owner, **{"If-None-Match": fresh})
+    assert response.status_code == 304
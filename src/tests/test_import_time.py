@@ -0,0 +1,67 @@
+"""
+Cold start budget.
+
+``import src`` is what every new worker pays before it can serve, so it is
+timed in a fresh interpreter. Celery, the SMTP client and the Redis client
+are loaded or built on first use; the app must not pull them in at import.
+The budget is generous for a developer machine and can be tightened (or
+loosened for a slow CI runner) with IMPORT_TIME_BUDGET_SECONDS.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IMPORT_TIME_BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET_SECONDS", 2.5))
+
+# Slowest of a few runs is noise, the fastest is what the import costs
+RUNS = 3
+
+DEFERRED_MODULES = ["celery", "kombu", "fastapi_mail", "src.celery_tasks", "src.mail"]
+
+PROBE = """
+import json, sys, time
+
+started = time.perf_counter()
+import src
+elapsed = time.perf_counter() - started
+
+import src.db.redis
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": sorted(sys.modules),
+    "redis_client_built": src.db.redis._redis_client is not None,
+}))
+"""
+
+
+def _import_src() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_defers_clients():
+    probe = _import_src()
+
+    loaded = [module for module in DEFERRED_MODULES if module in probe["modules"]]
+    assert loaded == [], f"import src loads {', '.join(loaded)}"
+    assert not probe["redis_client_built"]
+
+
+def test_import_stays_within_budget():
+    fastest = min(_import_src()["seconds"] for _ in range(RUNS))
+
+    assert fastest <= IMPORT_TIME_BUDGET_SECONDS, (
+        f"import src took {fastest:.2f}s, "
+        f"budget is {IMPORT_TIME_BUDGET_SECONDS:.2f}s"
+    )
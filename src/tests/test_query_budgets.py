@@ -0,0 +1,258 @@
+"""
+Query budgets per endpoint.
+
+Each route is called through the real app against the test database and
+may run at most its budgeted number of SQL statements. Caches start empty,
+so the budget covers the cold path: authenticating a token, checking the
+book cache and so on. A route added to one of the routers needs a budget
+here before the suite passes; raise one only with the query it pays for.
+"""
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import version
+from src.auth.routes import auth_router
+from src.auth.utils import (
+    create_access_token,
+    create_email_confirmation_token,
+    pwd_context,
+)
+from src.books.routes import book_router
+from src.db.models import Book, Review, User
+from src.reviews.routes import review_router
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "budget-password"
+HASHED_PASSWORD = pwd_context.hash(PASSWORD)
+
+ROUTERS = {
+    f"/api/{version}/books": book_router,
+    f"/api/{version}/auth": auth_router,
+    f"/api/{version}/reviews": review_router,
+}
+
+# Routes that never touch the database
+UNBUDGETED = {"POST /api/v1/auth/send-mail"}
+
+NEW_BOOK = {
+    "title": "Budgeted",
+    "author": "Author",
+    "publisher": "Publisher",
+    "publish_date": "2020",
+    "page_count": 100,
+    "language": "en",
+}
+
+
+@pytest.fixture
+async def account(pg_engine):
+    """An unverified user with a reviewed and an unreviewed book, and tokens."""
+    suffix = uuid.uuid4().hex[:12]
+    user = User(
+        email=f"budget-{suffix}@example.com",
+        username=f"budget-{suffix}",
+        first_name="Budget",
+        last_name="Check",
+        hashed_password=HASHED_PASSWORD,
+    )
+    book = Book(user_id=user.uid, **NEW_BOOK)
+    spare_book = Book(user_id=user.uid, **NEW_BOOK)
+    review = Review(user_id=user.uid, book_id=book.uid, rating=5, comment="Great")
+
+    async with AsyncSession(pg_engine, expire_on_commit=False) as session:
+        session.add(user)
+        await session.flush()
+        session.add_all([book, spare_book])
+        await session.flush()
+        session.add(review)
+        await session.commit()
+
+    user_payload = {"uid": str(user.uid), "email": user.email, "role": user.role}
+    access_token = create_access_token(user_payload)
+    refresh_token = create_access_token(
+        user_payload, expiry=timedelta(days=2), refresh=True
+    )
+
+    return {
+        "user_id": str(user.uid),
+        "email": user.email,
+        "book_id": str(book.uid),
+        "spare_book_id": str(spare_book.uid),
+        "email_token": create_email_confirmation_token(user.email),
+        "access": {"Authorization": f"Bearer {access_token}"},
+        "refresh": {"Authorization": f"Bearer {refresh_token}"},
+    }
+
+
+# route -> (budget, expected status, request)
+BUDGETS = {
+    "GET /api/v1/books/": (
+        2,
+        200,
+        lambda c, a: c.get("/api/v1/books/", headers=a["access"]),
+    ),
+    "GET /api/v1/books/search": (
+        2,
+        200,
+        lambda c, a: c.get(
+            "/api/v1/books/search", params={"q": "Budgeted"}, headers=a["access"]
+        ),
+    ),
+    "GET /api/v1/books/export": (
+        2,
+        200,
+        lambda c, a: c.get("/api/v1/books/export", headers=a["access"]),
+    ),
+    "GET /api/v1/books/user/{user_id}": (
+        2,
+        200,
+        lambda c, a: c.get(f"/api/v1/books/user/{a['user_id']}", headers=a["access"]),
+    ),
+    "GET /api/v1/books/{book_id}": (
+        3,
+        200,
+        lambda c, a: c.get(f"/api/v1/books/{a['book_id']}", headers=a["access"]),
+    ),
+    "POST /api/v1/books/": (
+        3,
+        201,
+        lambda c, a: c.post("/api/v1/books/", json=NEW_BOOK, headers=a["access"]),
+    ),
+    "POST /api/v1/books/bulk": (
+        4,
+        200,
+        lambda c, a: c.post(
+            "/api/v1/books/bulk", json=[NEW_BOOK] * 3, headers=a["access"]
+        ),
+    ),
+    "PATCH /api/v1/books/{book_id}": (
+        2,
+        200,
+        lambda c, a: c.patch(
+            f"/api/v1/books/{a['book_id']}",
+            json={"title": "Renamed", "author": "Author", "publisher": "Publisher"},
+            headers=a["access"],
+        ),
+    ),
+    "DELETE /api/v1/books/{book_id}": (
+        2,
+        204,
+        lambda c, a: c.delete(
+            f"/api/v1/books/{a['spare_book_id']}", headers=a["access"]
+        ),
+    ),
+    "POST /api/v1/reviews/book/{book_id}": (
+        5,
+        200,
+        lambda c, a: c.post(
+            f"/api/v1/reviews/book/{a['book_id']}",
+            json={"rating": 4, "comment": "Fine"},
+            headers=a["access"],
+        ),
+    ),
+    "GET /api/v1/auth/verify-email": (
+        3,
+        200,
+        lambda c, a: c.get(
+            "/api/v1/auth/verify-email", params={"token": a["email_token"]}
+        ),
+    ),
+    "POST /api/v1/auth/signup": (
+        2,
+        201,
+        lambda c, a: c.post(
+            "/api/v1/auth/signup",
+            json={
+                "username": "newcomer",
+                "first_name": "New",
+                "last_name": "Comer",
+                "email": f"new-{uuid.uuid4().hex[:12]}@example.com",
+                "password": PASSWORD,
+            },
+        ),
+    ),
+    "POST /api/v1/auth/login": (
+        1,
+        200,
+        lambda c, a: c.post(
+            "/api/v1/auth/login", json={"email": a["email"], "password": PASSWORD}
+        ),
+    ),
+    "GET /api/v1/auth/refresh-token": (
+        0,
+        200,
+        lambda c, a: c.get("/api/v1/auth/refresh-token", headers=a["refresh"]),
+    ),
+    "GET /api/v1/auth/me": (
+        2,
+        200,
+        lambda c, a: c.get("/api/v1/auth/me", headers=a["access"]),
+    ),
+    "GET /api/v1/auth/me/books": (
+        2,
+        200,
+        lambda c, a: c.get("/api/v1/auth/me/books", headers=a["access"]),
+    ),
+    "GET /api/v1/auth/me/reviews": (
+        2,
+        200,
+        lambda c, a: c.get("/api/v1/auth/me/reviews", headers=a["access"]),
+    ),
+    "POST /api/v1/auth/logout": (
+        0,
+        200,
+        lambda c, a: c.post("/api/v1/auth/logout", headers=a["access"]),
+    ),
+    "POST /api/v1/auth/logout-all": (
+        0,
+        200,
+        lambda c, a: c.post("/api/v1/auth/logout-all", headers=a["access"]),
+    ),
+    "POST /api/v1/auth/reset-password-request": (
+        2,
+        200,
+        lambda c, a: c.post(
+            "/api/v1/auth/reset-password-request", json={"email": a["email"]}
+        ),
+    ),
+    "POST /api/v1/auth/reset-password": (
+        3,
+        200,
+        lambda c, a: c.post(
+            "/api/v1/auth/reset-password",
+            params={"token": a["email_token"]},
+            json={"password": "a-new-password"},
+        ),
+    ),
+}
+
+
+def test_every_route_has_a_budget():
+    routes = {
+        f"{method} {prefix}{route.path}"
+        for prefix, router in ROUTERS.items()
+        for route in router.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+    assert sorted(routes - UNBUDGETED - BUDGETS.keys()) == []
+    assert sorted(BUDGETS.keys() - routes) == []
+
+
+@pytest.mark.parametrize("route", list(BUDGETS))
+async def test_route_stays_within_query_budget(
+    route, db_client, account, assert_max_queries
+):
+    budget, expected_status, send = BUDGETS[route]
+
+    with assert_max_queries(budget):
+        response = await send(db_client, account)
+
+    assert response.status_code == expected_status, response.text
@@ -0,0 +1,219 @@
+"""
+Query plan regression suite.
+
+Every statement a service method sends is captured and re-run under
+``EXPLAIN`` against a seeded database. With ``enable_seqscan`` off the
+planner only falls back to a sequential scan when no index can serve the
+query, so a ``Seq Scan`` on one of the large tables means an index is missing.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.services import UserService
+from src.books.schemas import BookUpdateModel
+from src.books.service import BookService
+from src.db.pagination import encode_cursor
+from src.reviews.schemas import ReviewCreateModel
+from src.reviews.services import ReviewService
+
+pytestmark = pytest.mark.anyio
+
+LARGE_TABLES = {"book", "review", "user"}
+
+SEED_USERS = 500
+SEED_BOOKS = 20_000
+SEED_REVIEWS = 40_000
+# A slice of the books gets no reviews, so delete paths have a clean target
+SEED_UNREVIEWED_BOOKS = 1_000
+
+book_service = BookService()
+user_service = UserService()
+review_service = ReviewService()
+
+
+@pytest.fixture(scope="module")
+async def seeded(pg_engine):
+    async with pg_engine.begin() as conn:
+        for table in ("review", "book", '"user"'):
+            await conn.execute(text(f"DELETE FROM {table}"))
+
+        await conn.execute(
+            text(
+                """
+                INSERT INTO "user" (uid, email, username, first_name, last_name,
+                                    hashed_password, is_verified, role,
+                                    created_at, updated_at)
+                SELECT gen_random_uuid(), 'user' || i || '@example.com',
+                       'user' || i, 'First', 'Last', '', true, 'user', now(), now()
+                FROM generate_series(1, :users) AS i
+                """
+            ),
+            {"users": SEED_USERS},
+        )
+        await conn.execute(
+            text(
+                """
+                WITH users AS (SELECT array_agg(uid) AS uids FROM "user")
+                INSERT INTO book (uid, title, author, publisher, publish_date,
+                                  page_count, language, user_id,
+                                  created_at, updated_at)
+                SELECT gen_random_uuid(), 'Book ' || i, 'Author ' || (i % 700),
+                       'Publisher ' || (i % 40), '2020', 100 + i % 400, 'en',
+                       users.uids[1 + i % :users],
+                       now() - i * interval '1 minute', now()
+                FROM generate_series(1, :books) AS i, users
+                """
+            ),
+            {"books": SEED_BOOKS, "users": SEED_USERS},
+        )
+        await conn.execute(
+            text(
+                """
+                WITH users AS (SELECT array_agg(uid) AS uids FROM "user"),
+                     books AS (SELECT array_agg(uid) AS uids FROM book)
+                INSERT INTO review (uid, book_id, user_id, rating, comment,
+                                    created_at, updated_at)
+                SELECT gen_random_uuid(), books.uids[1 + i % :reviewed_books],
+                       users.uids[1 + i % :users], 1 + i % 5, 'Review ' || i,
+                       now() - i * interval '1 second', now()
+                FROM generate_series(1, :reviews) AS i, users, books
+                """
+            ),
+            {
+                "reviews": SEED_REVIEWS,
+                "reviewed_books": SEED_BOOKS - SEED_UNREVIEWED_BOOKS,
+                "users": SEED_USERS,
+            },
+        )
+
+    async with pg_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+        user = (await conn.execute(text('SELECT uid, email FROM "user" LIMIT 1'))).one()
+        book = (
+            await conn.execute(
+                text("SELECT uid, created_at FROM book WHERE user_id = :uid LIMIT 1"),
+                {"uid": user.uid},
+            )
+        ).one()
+        unreviewed_book = (
+            await conn.execute(
+                text(
+                    "SELECT uid FROM book WHERE NOT EXISTS "
+                    "(SELECT 1 FROM review WHERE review.book_id = book.uid) LIMIT 1"
+                )
+            )
+        ).one()
+
+    return {
+        "user_id": user.uid,
+        "email": user.email,
+        "book_id": str(book.uid),
+        "cursor": encode_cursor(book.created_at, book.uid),
+        "unreviewed_book_id": str(unreviewed_book.uid),
+    }
+
+
+QUERY_CASES = {
+    "BookService.get_all_books": lambda s, d: book_service.get_all_books(s),
+    "BookService.get_all_books (cursor)": lambda s, d: book_service.get_all_books(
+        s, cursor=d["cursor"]
+    ),
+    "BookService.get_user_books": lambda s, d: book_service.get_user_books(
+        s, d["user_id"]
+    ),
+    "BookService.get_user_books (cursor)": lambda s, d: book_service.get_user_books(
+        s, d["user_id"], cursor=d["cursor"]
+    ),
+    "BookService.search_books": lambda s, d: book_service.search_books(
+        s, "Author 42"
+    ),
+    "BookService.get_page_validators": lambda s, d: (
+        book_service.get_page_validators(s, cursor=d["cursor"], user_id=d["user_id"])
+    ),
+    "BookService.get_book_validators": lambda s, d: (
+        book_service.get_book_validators(s, d["book_id"])
+    ),
+    "BookService.get_book": lambda s, d: book_service.get_book(s, d["book_id"]),
+    "BookService.get_book (reviews)": lambda s, d: book_service.get_book(
+        s, d["book_id"], load_reviews=True
+    ),
+    "BookService.update_book": lambda s, d: book_service.update_book(
+        s,
+        d["book_id"],
+        BookUpdateModel(title="Updated", author="Author", publisher="Publisher"),
+    ),
+    "BookService.delete_book": lambda s, d: book_service.delete_book(
+        s, d["unreviewed_book_id"]
+    ),
+    "UserService.get_user_by_email": lambda s, d: user_service.get_user_by_email(
+        s, d["email"]
+    ),
+    "UserService.get_user_profile": lambda s, d: user_service.get_user_profile(
+        s, d["user_id"]
+    ),
+    "UserService.get_principal_by_email": lambda s, d: (
+        user_service.get_principal_by_email(s, d["email"])
+    ),
+    "ReviewService.get_user_reviews": lambda s, d: review_service.get_user_reviews(
+        s, d["user_id"]
+    ),
+    "ReviewService.get_user_reviews (cursor)": lambda s, d: (
+        review_service.get_user_reviews(s, d["user_id"], cursor=d["cursor"])
+    ),
+    "ReviewService.add_review": lambda s, d: review_service.add_review(
+        s,
+        user_id=d["user_id"],
+        book_id=d["book_id"],
+        review_data=ReviewCreateModel(rating=4, comment="Plan check"),
+    ),
+}
+
+
+def _seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        yield plan["Relation Name"]
+
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+@pytest.mark.parametrize("case", list(QUERY_CASES))
+async def test_service_queries_use_indexes(case, pg_engine, seeded):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(pg_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with AsyncSession(pg_engine, expire_on_commit=False) as session:
+            await QUERY_CASES[case](session, seeded)
+    finally:
+        event.remove(pg_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert statements, f"{case} issued no queries"
+
+    async with pg_engine.connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            scanned = sorted(set(_seq_scans(plan[0]["Plan"])))
+            assert not scanned, (
+                f"{case} sequentially scans {', '.join(scanned)}:\n{statement}"
+            )
+
+        await conn.rollback()
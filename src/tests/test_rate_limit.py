@@ -0,0 +1,113 @@
+"""
+Rate limiters, run against fakeredis (with lupa for the Lua script).
+
+Each test mounts a limiter on a bare route with the app's error handlers,
+so a rejection is the 429 and Retry-After a client would see.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from prometheus_client import REGISTRY
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.auth import rate_limit
+from src.auth.rate_limit import RateLimiter
+from src.config import Config
+from src.errors import register_all_error_handlers
+
+pytestmark = pytest.mark.anyio
+
+WINDOW_SECONDS = 60
+
+
+def limited_app(limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+    register_all_error_handlers(app)
+
+    @app.post("/limited", dependencies=[Depends(limiter)])
+    async def limited():
+        return {"ok": True}
+
+    return app
+
+
+def client_for(app: FastAPI, ip: str) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=(ip, 40000))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def fallbacks() -> float:
+    return REGISTRY.get_sample_value("bookly_rate_limit_fallbacks_total") or 0
+
+
+async def send(client: httpx.AsyncClient, email: str = "reader@example.com"):
+    return await client.post("/limited", json={"email": email})
+
+
+async def test_allows_limit_then_rejects_with_retry_after(redis_store):
+    app = limited_app(RateLimiter("test", per_ip=3, window_seconds=WINDOW_SECONDS))
+
+    async with client_for(app, "10.0.0.1") as client:
+        for _ in range(3):
+            assert (await send(client)).status_code == 200
+
+        response = await send(client)
+
+    assert response.status_code == 429
+    assert response.json()["error_code"] == "RATE_LIMIT_EXCEEDED"
+    assert 0 < int(response.headers["Retry-After"]) <= WINDOW_SECONDS
+    assert await redis_store.zcard("rate_limit:test:ip:10.0.0.1") == 3
+
+
+async def test_ip_and_email_are_limited_separately(redis_store):
+    app = limited_app(
+        RateLimiter("test", per_ip=3, per_email=2, window_seconds=WINDOW_SECONDS)
+    )
+
+    async with client_for(app, "10.0.0.1") as first, client_for(
+        app, "10.0.0.2"
+    ) as second:
+        # The email limit follows the address across IPs
+        assert (await send(first, "Target@Example.com ")).status_code == 200
+        assert (await send(second, "target@example.com")).status_code == 200
+        assert (await send(second, "target@example.com")).status_code == 429
+
+        # The IP limit covers every address sent from it
+        assert (await send(first, "other@example.com")).status_code == 200
+        assert (await send(first, "third@example.com")).status_code == 200
+        assert (await send(first, "fourth@example.com")).status_code == 429
+
+        # The second IP has room left for addresses under their own limit
+        assert (await send(second, "other@example.com")).status_code == 200
+
+    assert await redis_store.zcard("rate_limit:test:email:target@example.com") == 2
+    assert await redis_store.zcard("rate_limit:test:ip:10.0.0.1") == 3
+
+
+async def failing_script(keys, args):
+    raise RedisConnectionError("Redis is down")
+
+
+async def slow_script(keys, args):
+    await asyncio.sleep(Config.RATE_LIMIT_REDIS_TIMEOUT_SECONDS * 10)
+    return 0
+
+
+@pytest.mark.parametrize("script", [failing_script, slow_script])
+async def test_falls_back_to_local_window(redis_store, monkeypatch, script):
+    monkeypatch.setattr(rate_limit, "sliding_window", script)
+    app = limited_app(RateLimiter("test", per_ip=2, window_seconds=WINDOW_SECONDS))
+    before = fallbacks()
+
+    async with client_for(app, "10.0.0.1") as client:
+        assert (await send(client)).status_code == 200
+        assert (await send(client)).status_code == 200
+        response = await send(client)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert fallbacks() - before == 3
+    assert list(rate_limit._local_windows) == ["rate_limit:test:ip:10.0.0.1"]
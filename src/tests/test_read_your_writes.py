@@ -0,0 +1,40 @@
+import uuid
+
+import pytest
+
+from src.db.main import READ_PRIMARY_COOKIE, replicas
+
+pytestmark = pytest.mark.anyio
+
+
+async def sign_up(client):
+    suffix = uuid.uuid4().hex[:12]
+    response = await client.post(
+        "/api/v1/auth/signup",
+        json={
+            "username": f"ryw-{suffix}",
+            "first_name": "Read",
+            "last_name": "Writes",
+            "email": f"ryw-{suffix}@example.com",
+            "password": "ryw-password",
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response
+
+
+async def test_write_without_replicas_sets_no_pin(db_client):
+    assert replicas.session_factories == []
+
+    response = await sign_up(db_client)
+
+    assert READ_PRIMARY_COOKIE not in response.cookies
+
+
+async def test_write_with_replicas_pins_reads_to_primary(db_client, monkeypatch):
+    # Reads still go through the overridden session; only the flag matters
+    monkeypatch.setattr(replicas, "session_factories", [object()])
+
+    response = await sign_up(db_client)
+
+    assert response.cookies[READ_PRIMARY_COOKIE] == "1"
@@ -0,0 +1,52 @@
+import uuid
+
+import pytest
+from fastapi import Request
+
+from src.auth.dependencies import AccessTokenBearer
+from src.auth.utils import create_access_token
+from src.db.redis import (
+    bump_token_generation,
+    get_token_generation,
+    token_generation_key,
+)
+from src.errors import InvalidTokenException
+
+pytestmark = pytest.mark.anyio
+
+
+def _request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+
+
+async def test_token_from_before_a_bump_is_rejected_after_key_would_expire(
+    redis_store,
+):
+    user_id = str(uuid.uuid4())
+    user_payload = {"uid": user_id, "email": "gen@example.com", "role": "user"}
+
+    await bump_token_generation(user_id)
+    # Login stamps the current generation; it does not touch the key
+    old_token = create_access_token(
+        user_payload, generation=await get_token_generation(user_id, fresh=True)
+    )
+
+    # A key with a TTL would be gone by the next bump, restarting the count
+    assert await redis_store.ttl(token_generation_key(user_id)) == -1
+
+    await bump_token_generation(user_id)
+
+    with pytest.raises(InvalidTokenException):
+        await AccessTokenBearer()(_request(old_token))
+
+    new_token = create_access_token(
+        user_payload, generation=await get_token_generation(user_id, fresh=True)
+    )
+    assert await AccessTokenBearer()(_request(new_token))